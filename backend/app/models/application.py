@@ -2,6 +2,7 @@ from typing import Optional, List
 from pydantic import BaseModel, Field
 from datetime import datetime
 from enum import Enum
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from app.models.base import MongoBaseModel
 
 # Enum untuk status aplikasi
@@ -10,16 +11,29 @@ class ApplicationStatus(str, Enum):
     ACCEPTED = "Accepted"
     REJECTED = "Rejected"
 
+# Indexes for the applications collection (applied by app.models.indexes)
+APPLICATION_INDEXES = [
+    IndexModel([("user_id", ASCENDING), ("job_post_id", ASCENDING)], name="user_id_job_post_id_unique", unique=True),
+    IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="user_id_created_at_id"),
+    IndexModel([("job_post_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="job_post_id_created_at_id"),
+    IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="status_created_at_id"),
+    IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+]
+
+# Formats of GET /applications/job/{job_post_id}/export
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
 class ApplicationBase(BaseModel):
     user_id: int
     job_post_id: int
     status: ApplicationStatus = ApplicationStatus.PENDING
-    cv_data: str  # Base64 encoded CV data
     cv_filename: str  # Original filename
     cv_content_type: str = "application/pdf"
 
 class ApplicationCreate(ApplicationBase):
-    pass
+    cv_data: str  # Base64 encoded CV data, stored in GridFS on create
 
 class ApplicationUpdate(BaseModel):
     status: Optional[ApplicationStatus] = None
@@ -27,7 +41,24 @@ class ApplicationUpdate(BaseModel):
     cv_filename: Optional[str] = None
     cv_content_type: Optional[str] = None
 
+class ApplicationBulkStatusUpdate(BaseModel):
+    application_ids: List[int] = Field(..., min_items=1, max_items=1000)
+    status: ApplicationStatus
+
+class BulkStatusResult(BaseModel):
+    application_id: int
+    result: str  # "updated", "not_found" or "forbidden"
+
+class ApplicationBulkStatusResponse(BaseModel):
+    updated: int
+    results: List[BulkStatusResult]
+
 class Application(ApplicationBase, MongoBaseModel):
+    # Reference to the CV in GridFS, download it from GET /applications/{id}/cv
+    cv_file_id: Optional[str] = None
+    cv_size: Optional[int] = None
+    cv_sha256: Optional[str] = None
+
     class Config:
         schema_extra = {
             "example": {
@@ -35,10 +66,32 @@ class Application(ApplicationBase, MongoBaseModel):
                 "user_id": 1,
                 "job_post_id": 1,
                 "status": "Pending",
-                "cv_data": "base64encodedcvdata...",
                 "cv_filename": "john_doe_cv.pdf",
                 "cv_content_type": "application/pdf",
+                "cv_file_id": "65a1b2c3d4e5f6a7b8c9d0e1",
+                "cv_size": 183204,
+                "cv_sha256": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
                 "created_at": "2023-01-01T00:00:00",
                 "updated_at": "2023-01-01T00:00:00"
             }
-        }
\ No newline at end of file
+        }
+
+# Fields returned by the list endpoints unless the caller asks for others
+APPLICATION_SUMMARY_FIELDS = [
+    "user_id", "job_post_id", "status", "cv_filename", "cv_content_type", "cv_size",
+    "created_at", "updated_at",
+]
+# Fields a caller may additionally request with ?fields=
+APPLICATION_LIST_FIELDS = APPLICATION_SUMMARY_FIELDS + ["cv_file_id", "cv_sha256", "cv_data"]
+
+class ApplicationSummary(MongoBaseModel):
+    """Application as listed; only the projected fields are present."""
+    user_id: Optional[int] = None
+    job_post_id: Optional[int] = None
+    status: Optional[ApplicationStatus] = None
+    cv_filename: Optional[str] = None
+    cv_content_type: Optional[str] = None
+    cv_size: Optional[int] = None
+    cv_file_id: Optional[str] = None
+    cv_sha256: Optional[str] = None
+    cv_data: Optional[str] = None  # Only on applications not yet migrated to GridFS
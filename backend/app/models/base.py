@@ -1,14 +1,35 @@
 from pydantic import BaseModel, Field
 from typing import Optional, Any
 from datetime import datetime
-import json
+from bson import ObjectId
 
 def convert_object_id(obj: Any) -> Any:
-    """Convert any object recursively for JSON serialization."""
+    """Turn any ObjectId inside a document into a string, for JSON serialization.
+
+    Containers are only copied along the path to an ObjectId. Stored documents
+    hold none (integer ids; GridFS ids are saved as strings), so the routes pass
+    them to their models without this walk.
+    """
+    if isinstance(obj, ObjectId):
+        return str(obj)
     if isinstance(obj, dict):
-        return {key: convert_object_id(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_object_id(item) for item in obj]
+        converted = None
+        for key, value in obj.items():
+            new_value = convert_object_id(value)
+            if new_value is not value:
+                if converted is None:
+                    converted = dict(obj)
+                converted[key] = new_value
+        return obj if converted is None else converted
+    if isinstance(obj, list):
+        converted = None
+        for index, item in enumerate(obj):
+            new_item = convert_object_id(item)
+            if new_item is not item:
+                if converted is None:
+                    converted = list(obj)
+                converted[index] = new_item
+        return obj if converted is None else converted
     return obj
 
 # Base model with simple integer id field
@@ -20,15 +41,7 @@ class MongoBaseModel(BaseModel):
     class Config:
         allow_population_by_field_name = True
         arbitrary_types_allowed = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-    
-    def dict(self, **kwargs):
-        """Override dict method to convert ObjectIds to strings."""
-        data = super().dict(**kwargs)
-        return convert_object_id(data)
         json_encoders = {
             ObjectId: str,
-            datetime: lambda dt: dt.isoformat(),
+            datetime: lambda v: v.isoformat()
         }
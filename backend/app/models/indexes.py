@@ -0,0 +1,104 @@
+"""Index registry for every collection, applied idempotently at startup.
+
+Run as a script to compare the declared indexes with the live database:
+
+    python -m app.models.indexes diff
+    python -m app.models.indexes apply
+"""
+import argparse
+import asyncio
+import json
+from typing import Dict, List
+
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+
+from app.models.user import USER_INDEXES
+from app.models.profile import PROFILE_INDEXES
+from app.models.job_post import JOB_POST_INDEXES
+from app.models.application import APPLICATION_INDEXES
+from app.models.job import JOB_INDEXES
+from app.models.recommendation import RECOMMENDATION_INDEXES
+
+# Collection name -> declared indexes
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": USER_INDEXES,
+    "profiles": PROFILE_INDEXES,
+    "job_posts": JOB_POST_INDEXES,
+    "applications": APPLICATION_INDEXES,
+    "jobs": JOB_INDEXES,
+    "recommendations": RECOMMENDATION_INDEXES,
+}
+
+# Index options that make two indexes with the same keys differ
+_COMPARED_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "weights", "partialFilterExpression")
+
+def _describe(spec: dict) -> dict:
+    """Normalize a declared or live index document for comparison."""
+    key = spec["key"]
+    key = list(key.items()) if isinstance(key, dict) else list(key)
+    described = {"name": spec["name"], "key": [[field, direction] for field, direction in key]}
+    if any(direction == "text" for _, direction in key):
+        # The server stores text indexes as _fts/_ftsx keys plus per-field weights
+        weights = {field: 1 for field, direction in key if direction == "text" and not field.startswith("_fts")}
+        weights.update(spec.get("weights") or {})
+        described["key"] = [["_fts", "text"], ["_ftsx", 1]]
+        spec = {**spec, "weights": weights}
+    for option in _COMPARED_OPTIONS:
+        if spec.get(option):
+            described[option] = dict(spec[option]) if option == "weights" else spec[option]
+    return described
+
+def _same_index(declared: dict, live: dict) -> bool:
+    return all(declared.get(option) == live.get(option) for option in ("key",) + _COMPARED_OPTIONS)
+
+async def ensure_indexes(db) -> Dict[str, List[str]]:
+    """Create every declared index; existing identical indexes are left untouched."""
+    created = {}
+    for collection_name, indexes in INDEXES.items():
+        created[collection_name] = []
+        for index in indexes:
+            # One call per index so a conflict (e.g. duplicate data under a unique
+            # index) does not prevent the remaining indexes from being built
+            try:
+                names = await db[collection_name].create_indexes([index])
+                created[collection_name].extend(names)
+            except OperationFailure as e:
+                print(f"Could not create index {index.document['name']} on {collection_name}: {e}")
+    return created
+
+async def diff_indexes(db) -> Dict[str, dict]:
+    """Compare the declared indexes with the live ones, per collection."""
+    result = {}
+    for collection_name, indexes in INDEXES.items():
+        info = await db[collection_name].index_information()
+        live = {
+            name: _describe({"name": name, **spec})
+            for name, spec in info.items()
+            if name != "_id_"
+        }
+        declared = {index.document["name"]: _describe(index.document) for index in indexes}
+        result[collection_name] = {
+            "missing": [declared[name] for name in declared if name not in live],
+            "extra": [live[name] for name in live if name not in declared],
+            "changed": [
+                {"declared": declared[name], "live": live[name]}
+                for name in declared
+                if name in live and not _same_index(declared[name], live[name])
+            ],
+        }
+    return result
+
+async def _main(command: str):
+    from database import db
+
+    if command == "apply":
+        result = await ensure_indexes(db)
+    else:
+        result = await diff_indexes(db)
+    print(json.dumps(result, indent=2, default=str))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare or apply the declared MongoDB indexes.")
+    parser.add_argument("command", choices=["diff", "apply"], nargs="?", default="diff")
+    asyncio.run(_main(parser.parse_args().command))
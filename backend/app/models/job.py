@@ -0,0 +1,47 @@
+from typing import Optional, Dict, Any
+from datetime import datetime
+from enum import Enum
+from pymongo import ASCENDING, IndexModel
+from app.models.base import MongoBaseModel
+
+# Status of a background job (see app.utils.jobs)
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+# Indexes for the jobs collection (applied by app.models.indexes)
+JOB_INDEXES = [
+    # Workers claim the oldest queued job, or a running one whose lock expired
+    IndexModel([("status", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)], name="status_created_at_id"),
+    IndexModel([("status", ASCENDING), ("locked_until", ASCENDING)], name="status_locked_until"),
+]
+
+class Job(MongoBaseModel):
+    type: str
+    params: Dict[str, Any] = {}
+    status: JobStatus = JobStatus.QUEUED
+    progress: Dict[str, Any] = {}
+    attempts: int = 0
+    error: Optional[str] = None
+    created_by: Optional[int] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "_id": 1,
+                "type": "delete_user",
+                "params": {"user_id": 42},
+                "status": "running",
+                "progress": {"job_posts": 120, "applications": 3400, "profiles": 0},
+                "attempts": 1,
+                "error": None,
+                "created_by": 42,
+                "created_at": "2023-01-01T00:00:00",
+                "started_at": "2023-01-01T00:00:01",
+                "finished_at": None,
+            }
+        }
@@ -2,6 +2,7 @@ from typing import Optional, List
 from pydantic import BaseModel, Field
 from datetime import datetime
 from enum import Enum
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
 from app.models.base import MongoBaseModel
 
 # Enum untuk jenis pekerjaan
@@ -11,6 +12,21 @@ class JobType(str, Enum):
     FREELANCE = "Freelance"
     OTHER = "Other"
 
+# Indexes for the job_posts collection (applied by app.models.indexes)
+JOB_POST_INDEXES = [
+    IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+    # Catch-up reads of the in-memory skill index (app/utils/skills.py)
+    IndexModel([("updated_at", DESCENDING)], name="updated_at", sparse=True),
+    IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="user_id_created_at_id"),
+    IndexModel([("job_type", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="job_type_created_at_id"),
+    # Full-text search over the descriptive fields, title matches weigh the most
+    IndexModel(
+        [("title", TEXT), ("company", TEXT), ("description", TEXT), ("requirements", TEXT)],
+        name="text_search",
+        weights={"title": 10, "company": 5, "requirements": 3, "description": 1},
+    ),
+]
+
 class JobPostBase(BaseModel):
     user_id: int
     title: str = Field(..., min_length=5, max_length=200)
@@ -43,6 +59,10 @@ class JobPostUpdate(BaseModel):
     salary_max: Optional[int] = Field(None, ge=0)
 
 class JobPost(JobPostBase, MongoBaseModel):
+    # Owner details, filled in on read
+    user_name: Optional[str] = None
+    user_email: Optional[str] = None
+
     class Config:
         schema_extra = {
             "example": {
@@ -56,7 +76,56 @@ class JobPost(JobPostBase, MongoBaseModel):
                 "requirements": ["3+ years Python experience", "Knowledge of Django/FastAPI", "Database experience"],
                 "salary_min": 8000000,
                 "salary_max": 12000000,
+                "user_name": "Tech Solutions HR",
+                "user_email": "hr@techsolutions.com",
                 "created_at": "2023-01-01T00:00:00",
                 "updated_at": "2023-01-01T00:00:00"
             }
         }
+
+class JobPostSearchResult(JobPost):
+    # Text search relevance, higher is better
+    score: float
+
+class FacetCount(BaseModel):
+    value: Optional[str]
+    count: int
+
+class SalaryBucket(BaseModel):
+    min: int
+    max: Optional[int]  # Exclusive; None for the open-ended top bucket
+    count: int
+
+class JobPostFacets(BaseModel):
+    total: int
+    job_type: List[FacetCount]
+    location: List[FacetCount]
+    salary: List[SalaryBucket]
+
+# Who GET /job-posts/{job_post_id}/matches ranks
+class MatchScope(str, Enum):
+    APPLICANTS = "applicants"
+    ALL = "all"
+
+class CandidateMatch(BaseModel):
+    user_id: int
+    full_name: Optional[str] = None
+    score: float  # Share of the required skills the candidate has, 0..1
+    matched_skills: List[str]
+
+class JobPostMatches(BaseModel):
+    job_post_id: int
+    scope: MatchScope
+    required_skills: List[str]
+    matches: List[CandidateMatch]
+
+class BulkImportRow(BaseModel):
+    row: int  # 1-based position in the request body
+    status: str  # "inserted", "invalid" or "failed"
+    id: Optional[int] = None
+    errors: Optional[List[str]] = None
+
+class JobPostBulkImportResponse(BaseModel):
+    inserted: int
+    failed: int
+    rows: List[BulkImportRow]
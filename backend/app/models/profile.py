@@ -2,6 +2,7 @@ from typing import Optional, List
 from pydantic import BaseModel, Field
 from datetime import datetime
 from enum import Enum
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from app.models.base import MongoBaseModel
 
 # Enum untuk gender
@@ -9,6 +10,14 @@ class Gender(str, Enum):
     MALE = "Male"
     FEMALE = "Female"
 
+# Indexes for the profiles collection (applied by app.models.indexes)
+PROFILE_INDEXES = [
+    IndexModel([("user_id", ASCENDING)], name="user_id_unique", unique=True),
+    IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+    # Catch-up reads of the in-memory skill index (app/utils/skills.py)
+    IndexModel([("updated_at", DESCENDING)], name="updated_at", sparse=True),
+]
+
 class ProfileBase(BaseModel):
     user_id: int
     full_name: str = Field(..., min_length=2, max_length=100)
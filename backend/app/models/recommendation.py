@@ -0,0 +1,36 @@
+from typing import Optional, List
+from pydantic import BaseModel
+from datetime import datetime
+from enum import Enum
+from pymongo import ASCENDING, IndexModel
+
+# Freshness of a stored recommendation feed
+class FeedStatus(str, Enum):
+    FRESH = "fresh"
+    STALE = "stale"  # Served as stored while a refresh runs
+    PENDING = "pending"  # Not computed yet
+
+# Indexes for the recommendations collection (applied by app.models.indexes)
+# Documents are keyed by user id, so the feed itself is read through _id
+RECOMMENDATION_INDEXES = [
+    # Removing a deleted job post from every feed that lists it
+    IndexModel([("items.job_post_id", ASCENDING)], name="items_job_post_id"),
+]
+
+class RecommendedJob(BaseModel):
+    job_post_id: int
+    title: str
+    company: str
+    location: str
+    job_type: str
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    score: float
+    matched_skills: List[str]
+
+class RecommendationFeed(BaseModel):
+    user_id: int
+    status: FeedStatus
+    computed_at: Optional[datetime] = None
+    job_id: Optional[int] = None  # Background job refreshing the feed, if one was started
+    items: List[RecommendedJob] = []
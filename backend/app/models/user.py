@@ -2,6 +2,7 @@ from typing import Optional, List
 from pydantic import BaseModel, Field, EmailStr
 from datetime import datetime
 from enum import Enum
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from app.models.base import MongoBaseModel
 
 # Enum untuk role user
@@ -10,6 +11,13 @@ class UserRole(str, Enum):
     EMPLOYER = "Employer"
     JOB_SEEKER = "Job Seeker"
 
+# Indexes for the users collection (applied by app.models.indexes)
+USER_INDEXES = [
+    IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+    IndexModel([("role", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="role_created_at_id"),
+]
+
 class UserBase(BaseModel):
     name: str = Field(..., min_length=2, max_length=100)
     email: EmailStr
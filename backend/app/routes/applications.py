@@ -1,14 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response, Form, File, UploadFile
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import datetime
 
-from app.models.application import Application, ApplicationCreate, ApplicationUpdate
-from app.models.base import convert_object_id
-from app.utils.pagination import PaginatedResponse
+from app.models.application import (
+    Application, ApplicationCreate, ApplicationUpdate, ApplicationStatus, ApplicationSummary,
+    ApplicationBulkStatusUpdate, ApplicationBulkStatusResponse, ExportFormat,
+    APPLICATION_SUMMARY_FIELDS, APPLICATION_LIST_FIELDS
+)
+from app.utils.http_cache import conditional_resource, conditional_list
+from app.utils.pagination import PaginatedResponse, fetch_page, page_number, count_total, invalidate_counts
 from app.utils.sequences import get_next_sequence_value
 from database import db, get_db
+from pymongo.errors import DuplicateKeyError
 from app.models.user import User
 from app.utils.auth import get_current_user
+from app.utils.cv_storage import (
+    decode_cv_data, store_cv, store_cv_upload, open_cv, iter_cv, delete_cv
+)
+from app.utils.exports import stream_csv, stream_ndjson
+from app.utils.recommendations import invalidate_recommendations
 
 router = APIRouter(
     prefix="/applications",
@@ -16,60 +27,128 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-@router.post("/", response_model=Application, status_code=status.HTTP_201_CREATED)
-async def create_application(application: ApplicationCreate, current_user: User = Depends(get_current_user), db = Depends(get_db)):
-    """Create a new job application."""
+def list_projection(fields: Optional[str]) -> dict:
+    """Mongo projection for the list endpoints: the summary, or the requested fields."""
+    if not fields:
+        return {field: 1 for field in APPLICATION_SUMMARY_FIELDS}
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in APPLICATION_LIST_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(APPLICATION_LIST_FIELDS)}"
+        )
+    return {field: 1 for field in requested}
+
+async def check_can_apply(user_id: int, job_post_id: int, current_user: User, db):
+    """Raise unless the current user may apply to the job post as `user_id`."""
     if current_user.role != "Job Seeker":
         raise HTTPException(status_code=403, detail="Only job seekers can apply for jobs")
-    if application.user_id != current_user.id:
+    if user_id != current_user.id:
         raise HTTPException(status_code=403, detail="You can only apply as yourself")
     # Check if user exists
-    user = await db.users.find_one({"_id": application.user_id})
+    user = await db.users.find_one({"_id": user_id})
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"User with ID {application.user_id} not found"
+            detail=f"User with ID {user_id} not found"
         )
     
     # Check if job post exists
-    job_post = await db.job_posts.find_one({"_id": application.job_post_id})
+    job_post = await db.job_posts.find_one({"_id": job_post_id})
     if not job_post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Job post with ID {application.job_post_id} not found"
+            detail=f"Job post with ID {job_post_id} not found"
         )
     
     # Check if application already exists
     existing_application = await db.applications.find_one({
-        "user_id": application.user_id,
-        "job_post_id": application.job_post_id
+        "user_id": user_id,
+        "job_post_id": job_post_id
     })
     if existing_application:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"You have already applied for this job"
         )
-    
+
+async def insert_application(application_data: dict, cv_reference: dict, db) -> Application:
+    """Insert an application whose CV is already stored, and return it."""
     # Get next ID for the application
     next_id = await get_next_sequence_value("applications")
     
-    # Create application
-    application_data = application.dict(by_alias=True)
+    application_data.update(cv_reference)
     application_data["_id"] = next_id
     application_data["created_at"] = datetime.utcnow()
     
     # Insert into database
-    await db.applications.insert_one(application_data)
+    try:
+        await db.applications.insert_one(application_data)
+    except DuplicateKeyError:
+        await delete_cv(db, cv_reference["cv_file_id"])
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"You have already applied for this job"
+        )
+    invalidate_counts("applications")
+    # The job applied to must leave the applicant's recommendations
+    await invalidate_recommendations(db, application_data["user_id"])
     
     # Retrieve and return the created application
     created_application = await db.applications.find_one({"_id": next_id})
     
-    return Application(**convert_object_id(created_application))
+    return Application(**created_application)
+
+@router.post("/", response_model=Application, status_code=status.HTTP_201_CREATED)
+async def create_application(application: ApplicationCreate, current_user: User = Depends(get_current_user), db = Depends(get_db)):
+    """Create a new job application with a base64 encoded CV."""
+    await check_can_apply(application.user_id, application.job_post_id, current_user, db)
+    
+    # Store the CV in GridFS; the application only keeps a reference
+    cv_data = decode_cv_data(application.cv_data)
+    cv_reference = await store_cv(db, cv_data, application.cv_filename, application.cv_content_type)
+    
+    application_data = application.dict(by_alias=True, exclude={"cv_data"})
+    return await insert_application(application_data, cv_reference, db)
+
+@router.post("/upload", response_model=Application, status_code=status.HTTP_201_CREATED)
+async def upload_application(
+    job_post_id: int = Form(...),
+    cv: UploadFile = File(...),
+    user_id: Optional[int] = Form(None),
+    current_user: User = Depends(get_current_user),
+    db = Depends(get_db)
+):
+    """Create a new job application from a multipart form with the CV as a file.
+
+    The file is copied to GridFS in chunks, so memory use does not grow with
+    the CV size. Its type is detected from the content, not the client header.
+    Oversized request bodies are refused by BodySizeLimitMiddleware (main.py)
+    before the form is parsed.
+    """
+    user_id = current_user.id if user_id is None else user_id
+    await check_can_apply(user_id, job_post_id, current_user, db)
+    
+    cv_reference = await store_cv_upload(db, cv)
+    application_data = {
+        "user_id": user_id,
+        "job_post_id": job_post_id,
+        "status": ApplicationStatus.PENDING,
+        "cv_filename": cv.filename or "cv",
+    }
+    return await insert_application(application_data, cv_reference, db)
 
-@router.get("/", response_model=PaginatedResponse[Application])
+@router.get("/", response_model=PaginatedResponse[ApplicationSummary], response_model_exclude_unset=True)
 async def read_applications(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    approximate_total: bool = False,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return instead of the summary"),
     status: Optional[str] = None,
     db = Depends(get_db)
 ):
@@ -80,22 +159,27 @@ async def read_applications(
         filter_query["status"] = status
     
     # Get total count for pagination
-    total = await db.applications.count_documents(filter_query)
+    total, total_is_approximate = await count_total(db.applications, filter_query, include_total, approximate_total)
     
     # Get paginated applications
-    cursor = db.applications.find(filter_query).sort("created_at", -1).skip(skip).limit(limit)
-    applications = await cursor.to_list(length=limit)
+    applications, next_cursor = await fetch_page(db.applications, filter_query, skip, limit, cursor, list_projection(fields))
+    
+    not_modified = conditional_list(request, response, "applications", applications, total, next_cursor, fields)
+    if not_modified:
+        return not_modified
     
     # Return paginated response
     return PaginatedResponse.create(
-        items=[Application(**convert_object_id(application)) for application in applications],
+        items=[ApplicationSummary(**application) for application in applications],
         total=total,
-        page=(skip // limit) + 1,
-        limit=limit
+        page=page_number(skip, limit, cursor),
+        limit=limit,
+        next_cursor=next_cursor,
+        total_is_approximate=total_is_approximate
     )
 
 @router.get("/{application_id}", response_model=Application)
-async def read_application(application_id: int, db = Depends(get_db)):
+async def read_application(application_id: int, request: Request, response: Response, db = Depends(get_db)):
     """Get a specific application by ID."""
     application = await db.applications.find_one({"_id": application_id})
     if not application:
@@ -104,54 +188,142 @@ async def read_application(application_id: int, db = Depends(get_db)):
             detail=f"Application with ID {application_id} not found"
         )
     
-    return Application(**convert_object_id(application))
+    not_modified = conditional_resource(request, response, "applications", application)
+    if not_modified:
+        return not_modified
+    return Application(**application)
 
-@router.get("/user/{user_id}", response_model=PaginatedResponse[Application])
+@router.get("/{application_id}/cv")
+async def download_application_cv(application_id: int, current_user: User = Depends(get_current_user), db = Depends(get_db)):
+    """Stream the CV attached to an application to the applicant, the job post owner or an admin."""
+    application = await db.applications.find_one(
+        {"_id": application_id},
+        {"user_id": 1, "job_post_id": 1, "cv_file_id": 1, "cv_filename": 1, "cv_content_type": 1, "cv_data": 1}
+    )
+    if not application:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Application with ID {application_id} not found"
+        )
+    if current_user.role != "Admin" and application["user_id"] != current_user.id:
+        job_post = await db.job_posts.find_one({"_id": application["job_post_id"]}, {"user_id": 1})
+        if not job_post or job_post["user_id"] != current_user.id:
+            raise HTTPException(status_code=403, detail="Not authorized to download this CV")
+    
+    filename = (application.get("cv_filename") or f"cv-{application_id}").replace('"', "")
+    media_type = application.get("cv_content_type") or "application/pdf"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    
+    # Applications not yet migrated to GridFS still carry the base64 payload
+    if not application.get("cv_file_id"):
+        if not application.get("cv_data"):
+            raise HTTPException(status_code=404, detail="This application has no CV")
+        return Response(decode_cv_data(application["cv_data"]), media_type=media_type, headers=headers)
+    
+    grid_out = await open_cv(db, application["cv_file_id"])
+    if grid_out is None:
+        raise HTTPException(status_code=404, detail="CV file not found")
+    headers["Content-Length"] = str(grid_out.length)
+    return StreamingResponse(iter_cv(grid_out), media_type=media_type, headers=headers)
+
+@router.get("/user/{user_id}", response_model=PaginatedResponse[ApplicationSummary], response_model_exclude_unset=True)
 async def read_applications_by_user(
     user_id: int,
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    approximate_total: bool = False,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return instead of the summary"),
     db = Depends(get_db)
 ):
     """Get applications by user ID."""
     # Get total count for pagination
-    total = await db.applications.count_documents({"user_id": user_id})
+    total, total_is_approximate = await count_total(db.applications, {"user_id": user_id}, include_total, approximate_total)
     
     # Get paginated applications
-    cursor = db.applications.find({"user_id": user_id}).sort("created_at", -1).skip(skip).limit(limit)
-    applications = await cursor.to_list(length=limit)
+    applications, next_cursor = await fetch_page(db.applications, {"user_id": user_id}, skip, limit, cursor, list_projection(fields))
+    
+    not_modified = conditional_list(request, response, "applications", applications, total, next_cursor, fields)
+    if not_modified:
+        return not_modified
     
     # Return paginated response
     return PaginatedResponse.create(
-        items=[Application(**convert_object_id(application)) for application in applications],
+        items=[ApplicationSummary(**application) for application in applications],
         total=total,
-        page=(skip // limit) + 1,
-        limit=limit
+        page=page_number(skip, limit, cursor),
+        limit=limit,
+        next_cursor=next_cursor,
+        total_is_approximate=total_is_approximate
     )
 
-@router.get("/job/{job_post_id}", response_model=PaginatedResponse[Application])
+@router.get("/job/{job_post_id}", response_model=PaginatedResponse[ApplicationSummary], response_model_exclude_unset=True)
 async def read_applications_by_job_post(
     job_post_id: int,
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    approximate_total: bool = False,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return instead of the summary"),
     db = Depends(get_db)
 ):
     """Get applications by job post ID."""
     # Get total count for pagination
-    total = await db.applications.count_documents({"job_post_id": job_post_id})
+    total, total_is_approximate = await count_total(db.applications, {"job_post_id": job_post_id}, include_total, approximate_total)
     
     # Get paginated applications
-    cursor = db.applications.find({"job_post_id": job_post_id}).sort("created_at", -1).skip(skip).limit(limit)
-    applications = await cursor.to_list(length=limit)
+    applications, next_cursor = await fetch_page(db.applications, {"job_post_id": job_post_id}, skip, limit, cursor, list_projection(fields))
+    
+    not_modified = conditional_list(request, response, "applications", applications, total, next_cursor, fields)
+    if not_modified:
+        return not_modified
     
     # Return paginated response
     return PaginatedResponse.create(
-        items=[Application(**convert_object_id(application)) for application in applications],
+        items=[ApplicationSummary(**application) for application in applications],
         total=total,
-        page=(skip // limit) + 1,
-        limit=limit
+        page=page_number(skip, limit, cursor),
+        limit=limit,
+        next_cursor=next_cursor,
+        total_is_approximate=total_is_approximate
     )
 
+@router.get("/job/{job_post_id}/export")
+async def export_applications_by_job_post(
+    job_post_id: int,
+    format: ExportFormat = ExportFormat.CSV,
+    current_user: User = Depends(get_current_user),
+    db = Depends(get_db)
+):
+    """Download every application of a job post, with the applicant's profile, as CSV or NDJSON.
+
+    Rows are streamed from the cursor batch by batch, so memory use does not
+    grow with the number of applications.
+    """
+    job_post = await db.job_posts.find_one({"_id": job_post_id}, {"user_id": 1})
+    if not job_post:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job post with ID {job_post_id} not found"
+        )
+    # Authorization: Only Admin or the employer who owns the job post
+    if current_user.role != "Admin" and job_post["user_id"] != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to export these applications")
+    
+    filter_query = {"job_post_id": job_post_id}
+    if format == ExportFormat.NDJSON:
+        body, media_type = stream_ndjson(db, filter_query), "application/x-ndjson"
+    else:
+        body, media_type = stream_csv(db, filter_query), "text/csv; charset=utf-8"
+    headers = {"Content-Disposition": f'attachment; filename="applications-job-{job_post_id}.{format.value}"'}
+    return StreamingResponse(body, media_type=media_type, headers=headers)
+
 @router.put("/{application_id}", response_model=Application)
 async def update_application(
     application_id: int,
@@ -180,18 +352,86 @@ async def update_application(
     if current_user.role not in ["Admin", "Employer", "Job Seeker"]:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    # Update application
+    # Update application; a new CV replaces the stored file
     update_data = application.dict(exclude_unset=True, by_alias=True)
+    replaced_cv_id = None
+    cv_data = update_data.pop("cv_data", None)
+    if cv_data:
+        cv_reference = await store_cv(
+            db,
+            decode_cv_data(cv_data),
+            update_data.get("cv_filename") or existing_application.get("cv_filename"),
+            update_data.get("cv_content_type") or existing_application.get("cv_content_type", "application/pdf")
+        )
+        update_data.update(cv_reference)
+        replaced_cv_id = existing_application.get("cv_file_id")
     if update_data:
         update_data["updated_at"] = datetime.utcnow()
         await db.applications.update_one(
             {"_id": application_id},
             {"$set": update_data}
         )
+        invalidate_counts("applications")
+    if replaced_cv_id:
+        await delete_cv(db, replaced_cv_id)
     
     # Return updated application
     updated_application = await db.applications.find_one({"_id": application_id})
-    return Application(**convert_object_id(updated_application))
+    return Application(**updated_application)
+
+@router.post("/bulk-status", response_model=ApplicationBulkStatusResponse)
+async def bulk_update_application_status(
+    bulk_update: ApplicationBulkStatusUpdate,
+    current_user: User = Depends(get_current_user),
+    db = Depends(get_db)
+):
+    """Accept or reject many applications at once.
+
+    Ownership of every application is checked with one aggregation and the
+    allowed ones are updated with one update_many. Employers may only change
+    applications to their own job posts; admins may change any.
+    """
+    if current_user.role not in ["Admin", "Employer"]:
+        raise HTTPException(status_code=403, detail="Only employers can review applications")
+    
+    application_ids = list(dict.fromkeys(bulk_update.application_ids))
+    
+    # Resolve the owner of each application's job post in a single round trip
+    pipeline = [
+        {"$match": {"_id": {"$in": application_ids}}},
+        {"$lookup": {
+            "from": "job_posts",
+            "localField": "job_post_id",
+            "foreignField": "_id",
+            "as": "job_post"
+        }},
+        {"$project": {"owner_id": {"$arrayElemAt": ["$job_post.user_id", 0]}}}
+    ]
+    owners = {
+        row["_id"]: row.get("owner_id")
+        async for row in db.applications.aggregate(pipeline)
+    }
+    
+    results = []
+    allowed = []
+    for application_id in application_ids:
+        if application_id not in owners:
+            result = "not_found"
+        elif current_user.role != "Admin" and owners[application_id] != current_user.id:
+            result = "forbidden"
+        else:
+            result = "updated"
+            allowed.append(application_id)
+        results.append({"application_id": application_id, "result": result})
+    
+    if allowed:
+        await db.applications.update_many(
+            {"_id": {"$in": allowed}},
+            {"$set": {"status": bulk_update.status, "updated_at": datetime.utcnow()}}
+        )
+        invalidate_counts("applications")
+    
+    return {"updated": len(allowed), "results": results}
 
 @router.delete("/{application_id}")
 async def delete_application(application_id: int, current_user: User = Depends(get_current_user), db = Depends(get_db)):
@@ -206,7 +446,10 @@ async def delete_application(application_id: int, current_user: User = Depends(g
     if current_user.role != "Admin" and application["user_id"] != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this application")
     
-    # Delete the application
+    # Delete the application and its CV
     await db.applications.delete_one({"_id": application_id})
+    if application.get("cv_file_id"):
+        await delete_cv(db, application["cv_file_id"])
+    invalidate_counts("applications")
     
     return {"message": f"Application {application_id} deleted successfully"}
@@ -4,14 +4,15 @@ from typing import Dict
 from datetime import datetime, timedelta
 
 from app.models.user import User, UserCreate, UserRole
-from app.utils.security import get_password_hash
+from app.utils.security import get_password_hash_async, verify_password_async
 from app.utils.auth import (
     authenticate_user, create_access_token, 
     get_current_user, ACCESS_TOKEN_EXPIRE_MINUTES
 )
-from app.models.base import convert_object_id
 from app.utils.sequences import get_next_sequence_value
+from app.utils.pagination import invalidate_counts
 from database import db, get_db
+from pymongo.errors import DuplicateKeyError
 
 router = APIRouter(
     prefix="/auth",
@@ -58,18 +59,24 @@ async def register_user(user: UserCreate, db = Depends(get_db)):
     # Get next ID for the user
     next_id = await get_next_sequence_value("users")
       # Create user with hashed password
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     user_data = user.dict(exclude={"password"})  # Exclude the original password
     user_data["_id"] = next_id
     user_data["hashed_password"] = hashed_password
     user_data["created_at"] = datetime.utcnow()
     
-    # Insert into database
-    await db.users.insert_one(user_data)
+    # Insert into database (the unique email index catches concurrent registrations)
+    try:
+        await db.users.insert_one(user_data)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Email {user.email} already registered"
+        )
+    invalidate_counts("users")
     
     # Return created user
     created_user = await db.users.find_one({"_id": next_id})
-    created_user = convert_object_id(created_user)
     return User(**created_user)
 
 @router.get("/me", response_model=User)
@@ -98,8 +105,7 @@ async def verify_user_password(
         return {"verified": False}
     
     # Verify password
-    from app.utils.security import verify_password
-    if not verify_password(password, user["hashed_password"]):
+    if not await verify_password_async(password, user["hashed_password"]):
         return {"verified": False}
     
     return {"verified": True}
@@ -1,13 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from typing import List, Optional
 from datetime import datetime
+import json
+import os
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
 
-from app.models.job_post import JobPost, JobPostCreate, JobPostUpdate
+from app.models.job_post import (
+    JobPost, JobPostCreate, JobPostUpdate, JobPostSearchResult, JobPostFacets, JobPostBulkImportResponse,
+    JobPostMatches, MatchScope
+)
 from app.models.user import User
-from app.models.base import convert_object_id
-from app.utils.pagination import PaginatedResponse
+from app.utils.http_cache import conditional_resource, conditional_list
+from app.utils.responses import FAST_JSON_RESPONSES, fast_page
+from app.utils.pagination import PaginatedResponse, fetch_page, page_number, count_total, invalidate_counts
 from app.utils.auth import get_current_user
-from app.utils.sequences import get_next_sequence_value
+from app.utils.sequences import get_next_sequence_value, reserve_sequence_block
+from app.utils.jobs import enqueue_job
+from app.utils.cascades import DELETE_JOB_POST_JOB
+from app.utils.facets import get_job_post_facets, invalidate_job_post_facets
+from app.utils.recommendations import invalidate_all_recommendations
+from app.utils.skills import (
+    profile_skill_index, known_skills, ensure_skill_indexes, index_job_post, unindex_job_post, unindex_profile
+)
 from database import db, get_db
 
 router = APIRouter(
@@ -16,6 +31,11 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# Limits for POST /job-posts/bulk; the body size is enforced by BodySizeLimitMiddleware (main.py)
+BULK_IMPORT_MAX_ROWS = int(os.getenv("BULK_IMPORT_MAX_ROWS", 5000))
+BULK_IMPORT_MAX_BYTES = int(os.getenv("BULK_IMPORT_MAX_BYTES", 10 * 1024 * 1024))
+BULK_INSERT_BATCH_SIZE = 500
+
 @router.post("/", response_model=JobPost, status_code=status.HTTP_201_CREATED)
 async def create_job_post(
     job_post: JobPostCreate, 
@@ -41,34 +61,142 @@ async def create_job_post(
     
     # Insert into database
     await db.job_posts.insert_one(job_post_data)
+    invalidate_counts("job_posts")
+    invalidate_job_post_facets()
+    index_job_post(job_post_data)
+    await invalidate_all_recommendations(db)
       
     # Retrieve and return the created job post
     created_job_post = await db.job_posts.find_one({"_id": next_id})
     
-    return JobPost(**convert_object_id(created_job_post))
+    return JobPost(**created_job_post)
+
+async def _iter_bulk_items(request: Request):
+    """Yield the raw items of a bulk body, NDJSON line by line or from a JSON array.
+
+    A JSON array is parsed in one piece; the body was capped at
+    BULK_IMPORT_MAX_BYTES before it is read.
+    """
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonl" in content_type:
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                yield line
+        yield buffer
+        return
+    try:
+        items = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    for item in items:
+        yield item
+
+def _validation_messages(error: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()]
+
+@router.post("/bulk", response_model=JobPostBulkImportResponse)
+async def bulk_import_job_posts(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db = Depends(get_db)
+):
+    """Import many job posts from a JSON array or NDJSON (application/x-ndjson) body.
+
+    Every item is validated as a JobPostCreate while the body is read. IDs for
+    all valid rows are reserved with one counter increment, and rows are
+    inserted with unordered insert_many batches. The response reports each
+    row as inserted, invalid or failed.
+    """
+    if current_user.role != "Employer":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only employers can create job posts"
+        )
+    
+    rows = []
+    valid = []  # (row index in `rows`, document)
+    row_number = 0
+    async for item in _iter_bulk_items(request):
+        if isinstance(item, bytes) and not item.strip():
+            continue
+        # Count every row, parsable or not, so garbage lines cannot grow `rows` without bound
+        row_number += 1
+        if row_number > BULK_IMPORT_MAX_ROWS:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"At most {BULK_IMPORT_MAX_ROWS} job posts can be imported at once"
+            )
+        if isinstance(item, bytes):
+            try:
+                item = json.loads(item)
+            except ValueError:
+                rows.append({"row": row_number, "status": "invalid", "errors": ["Invalid JSON"]})
+                continue
+        try:
+            job_post = JobPostCreate.parse_obj(item)
+        except ValidationError as e:
+            rows.append({"row": row_number, "status": "invalid", "errors": _validation_messages(e)})
+            continue
+        valid.append((len(rows), job_post.dict(by_alias=True)))
+        rows.append({"row": row_number, "status": "inserted"})
+    
+    if valid:
+        # One counter increment covers every valid row
+        high = await reserve_sequence_block("job_posts", len(valid))
+        now = datetime.utcnow()
+        for offset, (_, job_post_data) in enumerate(valid):
+            job_post_data["_id"] = high - len(valid) + 1 + offset
+            job_post_data["user_id"] = current_user.id
+            job_post_data["created_at"] = now
+        
+        for start in range(0, len(valid), BULK_INSERT_BATCH_SIZE):
+            batch = valid[start:start + BULK_INSERT_BATCH_SIZE]
+            try:
+                await db.job_posts.insert_many([document for _, document in batch], ordered=False)
+            except BulkWriteError as e:
+                for error in e.details.get("writeErrors", []):
+                    row_index = batch[error["index"]][0]
+                    rows[row_index]["status"] = "failed"
+                    rows[row_index]["errors"] = [error.get("errmsg", "Insert failed")]
+        for row_index, job_post_data in valid:
+            if rows[row_index]["status"] == "inserted":
+                rows[row_index]["id"] = job_post_data["_id"]
+                index_job_post(job_post_data)
+        invalidate_counts("job_posts")
+        invalidate_job_post_facets()
+        await invalidate_all_recommendations(db)
+    
+    inserted = sum(1 for row in rows if row["status"] == "inserted")
+    return {"inserted": inserted, "failed": len(rows) - inserted, "rows": rows}
+
+async def enrich_job_posts_with_users(job_posts, db):
+    """Fill user_name/user_email on a page of job posts with a single users query."""
+    user_ids = list({job_post.get("user_id") for job_post in job_posts})
+    users = {}
+    if user_ids:
+        cursor = db.users.find({"_id": {"$in": user_ids}}, {"name": 1, "email": 1})
+        users = {user["_id"]: user async for user in cursor}
+    for job_post in job_posts:
+        user = users.get(job_post.get("user_id"))
+        job_post["user_name"] = user.get("name") if user else None
+        job_post["user_email"] = user.get("email") if user else None
+    return job_posts
 
 async def enrich_job_post_with_user(job_post, db):
-    user = await db.users.find_one({"_.id": job_post.get("user_id")})
-    if user:
-        job_post["user_name"] = user.get("name")
-        job_post["user_email"] = user.get("email")
-    else:
-        job_post["user_name"] = None
-        job_post["user_email"] = None
-    return job_post
+    return (await enrich_job_posts_with_users([job_post], db))[0]
 
-@router.get("/", response_model=PaginatedResponse[JobPost])
-async def read_job_posts(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(10, ge=1, le=100),
+def build_job_post_filter(
     job_type: Optional[str] = None,
     title: Optional[str] = None,
-    min_salary: Optional[int] = Query(None, ge=0),
-    max_salary: Optional[int] = Query(None, ge=0),
-    db = Depends(get_db)
-):
-    """Get a paginated list of job posts with optional filtering."""
-    # Build filter
+    min_salary: Optional[int] = None,
+    max_salary: Optional[int] = None
+) -> dict:
+    """Build the Mongo filter shared by the job post listing endpoints."""
     filter_query = {}
     if job_type:
         filter_query["job_type"] = job_type
@@ -85,25 +213,98 @@ async def read_job_posts(
             ]
         else:
             filter_query["salary_max"] = {"$lte": max_salary}
+    return filter_query
+
+@router.get("/", response_model=PaginatedResponse[JobPost])
+async def read_job_posts(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    approximate_total: bool = False,
+    job_type: Optional[str] = None,
+    title: Optional[str] = None,
+    min_salary: Optional[int] = Query(None, ge=0),
+    max_salary: Optional[int] = Query(None, ge=0),
+    db = Depends(get_db)
+):
+    """Get a paginated list of job posts with optional filtering."""
+    filter_query = build_job_post_filter(job_type, title, min_salary, max_salary)
     
     # Get total count for pagination
-    total = await db.job_posts.count_documents(filter_query)
+    total, total_is_approximate = await count_total(db.job_posts, filter_query, include_total, approximate_total)
     
     # Get paginated job posts with sorting (newest first)
-    cursor = db.job_posts.find(filter_query).sort("created_at", -1).skip(skip).limit(limit)
-    job_posts = await cursor.to_list(length=limit)
-    # Enrich each job post with user info
-    job_posts = [await enrich_job_post_with_user(job_post, db) for job_post in job_posts]
+    job_posts, next_cursor = await fetch_page(db.job_posts, filter_query, skip, limit, cursor)
+    # Enrich the page with user info in one query
+    job_posts = await enrich_job_posts_with_users(job_posts, db)
+    owners = [(job_post["user_name"], job_post["user_email"]) for job_post in job_posts]
+    not_modified = conditional_list(request, response, "job_posts", job_posts, total, next_cursor, owners)
+    if not_modified:
+        return not_modified
+    
+    # Documents come straight from our own collection: skip revalidation
+    if FAST_JSON_RESPONSES:
+        return fast_page(
+            JobPost, job_posts, total, page_number(skip, limit, cursor), limit,
+            next_cursor, total_is_approximate, headers=dict(response.headers)
+        )
+    
     # Return paginated response
     return PaginatedResponse.create(
-        items=[JobPost(**convert_object_id(job_post)) for job_post in job_posts],
+        items=[JobPost(**job_post) for job_post in job_posts],
         total=total,
-        page=(skip // limit) + 1,
+        page=page_number(skip, limit, cursor),
+        limit=limit,
+        next_cursor=next_cursor,
+        total_is_approximate=total_is_approximate
+    )
+
+@router.get("/search", response_model=PaginatedResponse[JobPostSearchResult])
+async def search_job_posts(
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    include_total: bool = True,
+    job_type: Optional[str] = None,
+    min_salary: Optional[int] = Query(None, ge=0),
+    max_salary: Optional[int] = Query(None, ge=0),
+    db = Depends(get_db)
+):
+    """Full-text search over title, company, description and requirements, best matches first."""
+    filter_query = build_job_post_filter(job_type, None, min_salary, max_salary)
+    filter_query["$text"] = {"$search": q}
+    
+    total, _ = await count_total(db.job_posts, filter_query, include_total)
+    
+    # Served by the text_search index, ranked by relevance
+    score = {"$meta": "textScore"}
+    cursor = db.job_posts.find(filter_query, {"score": score}).sort([("score", score), ("_id", -1)]).skip(skip).limit(limit)
+    job_posts = await cursor.to_list(length=limit)
+    job_posts = await enrich_job_posts_with_users(job_posts, db)
+    return PaginatedResponse.create(
+        items=[JobPostSearchResult(**job_post) for job_post in job_posts],
+        total=total,
+        page=page_number(skip, limit),
         limit=limit
     )
 
+@router.get("/facets", response_model=JobPostFacets)
+async def read_job_post_facets(
+    job_type: Optional[str] = None,
+    title: Optional[str] = None,
+    min_salary: Optional[int] = Query(None, ge=0),
+    max_salary: Optional[int] = Query(None, ge=0),
+    db = Depends(get_db)
+):
+    """Counts per job type, location and salary bucket for the same filters as the listing."""
+    filter_query = build_job_post_filter(job_type, title, min_salary, max_salary)
+    return await get_job_post_facets(db, filter_query)
+
 @router.get("/{job_post_id}", response_model=JobPost)
-async def read_job_post(job_post_id: int, db = Depends(get_db)):
+async def read_job_post(job_post_id: int, request: Request, response: Response, db = Depends(get_db)):
     """Get a specific job post by ID."""
     job_post = await db.job_posts.find_one({"_id": job_post_id})
     if not job_post:
@@ -112,30 +313,108 @@ async def read_job_post(job_post_id: int, db = Depends(get_db)):
             detail=f"Job post with ID {job_post_id} not found"
         )
     job_post = await enrich_job_post_with_user(job_post, db)
-    return JobPost(**convert_object_id(job_post))
+    not_modified = conditional_resource(
+        request, response, "job_posts", job_post, job_post["user_name"], job_post["user_email"]
+    )
+    if not_modified:
+        return not_modified
+    return JobPost(**job_post)
+
+@router.get("/{job_post_id}/matches", response_model=JobPostMatches)
+async def match_candidates(
+    job_post_id: int,
+    scope: MatchScope = MatchScope.APPLICANTS,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db = Depends(get_db)
+):
+    """Rank applicants, or every job seeker, by how many of the job's required skills they have.
+
+    Requirements are matched against the normalized skill vocabulary of all
+    profiles and scored on the in-memory skill index, which is brought up to
+    date with other processes' writes first (see ensure_skill_indexes).
+    """
+    job_post = await db.job_posts.find_one({"_id": job_post_id}, {"user_id": 1, "requirements": 1})
+    if not job_post:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job post with ID {job_post_id} not found"
+        )
+    # Authorization: Only Admin or owner (Employer) can see candidates
+    if current_user.role != "Admin" and job_post["user_id"] != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to view candidates for this job post")
+    
+    await ensure_skill_indexes(db)
+    skills = known_skills(job_post.get("requirements"))
+    candidates = None
+    if scope == MatchScope.APPLICANTS:
+        candidates = await db.applications.distinct("user_id", {"job_post_id": job_post_id})
+    ranked = profile_skill_index.score(skills, candidates, limit)
+    
+    # Names for the returned page only
+    user_ids = [user_id for user_id, _ in ranked]
+    cursor = db.profiles.find({"user_id": {"$in": user_ids}}, {"user_id": 1, "full_name": 1})
+    names = {profile["user_id"]: profile.get("full_name") async for profile in cursor}
+    # Profiles deleted through another process stay indexed until the next rebuild
+    for user_id in set(user_ids) - set(names):
+        unindex_profile(user_id)
+    ranked = [(user_id, shared) for user_id, shared in ranked if user_id in names]
+    
+    return JobPostMatches(
+        job_post_id=job_post_id,
+        scope=scope,
+        required_skills=sorted(skills),
+        matches=[
+            {
+                "user_id": user_id,
+                "full_name": names.get(user_id),
+                "score": round(shared / len(skills), 4),
+                "matched_skills": sorted(skills & profile_skill_index.skills_of(user_id)),
+            }
+            for user_id, shared in ranked
+        ]
+    )
 
 @router.get("/user/{user_id}", response_model=PaginatedResponse[JobPost])
 async def read_job_posts_by_user(
     user_id: int,
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    approximate_total: bool = False,
     db = Depends(get_db)
 ):
     """Get job posts by user ID."""
     # Get total count for pagination
-    total = await db.job_posts.count_documents({"user_id": user_id})
+    total, total_is_approximate = await count_total(db.job_posts, {"user_id": user_id}, include_total, approximate_total)
       
     # Get paginated job posts with sorting (newest first)
-    cursor = db.job_posts.find({"user_id": user_id}).sort("created_at", -1).skip(skip).limit(limit)
-    job_posts = await cursor.to_list(length=limit)
-    # Enrich each job post with user info
-    job_posts = [await enrich_job_post_with_user(job_post, db) for job_post in job_posts]
+    job_posts, next_cursor = await fetch_page(db.job_posts, {"user_id": user_id}, skip, limit, cursor)
+    # Enrich the page with user info in one query
+    job_posts = await enrich_job_posts_with_users(job_posts, db)
+    owners = [(job_post["user_name"], job_post["user_email"]) for job_post in job_posts]
+    not_modified = conditional_list(request, response, "job_posts", job_posts, total, next_cursor, owners)
+    if not_modified:
+        return not_modified
+    
+    # Documents come straight from our own collection: skip revalidation
+    if FAST_JSON_RESPONSES:
+        return fast_page(
+            JobPost, job_posts, total, page_number(skip, limit, cursor), limit,
+            next_cursor, total_is_approximate, headers=dict(response.headers)
+        )
+    
     # Return paginated response
     return PaginatedResponse.create(
-        items=[JobPost(**convert_object_id(job_post)) for job_post in job_posts],
+        items=[JobPost(**job_post) for job_post in job_posts],
         total=total,
-        page=(skip // limit) + 1,
-        limit=limit
+        page=page_number(skip, limit, cursor),
+        limit=limit,
+        next_cursor=next_cursor,
+        total_is_approximate=total_is_approximate
     )
 
 @router.put("/{job_post_id}", response_model=JobPost)
@@ -164,13 +443,18 @@ async def update_job_post(
             {"_id": job_post_id},
             {"$set": update_data}
         )
+        invalidate_counts("job_posts")
+        invalidate_job_post_facets()
     # Return updated job post
     updated_job_post = await db.job_posts.find_one({"_id": job_post_id})
-    return JobPost(**convert_object_id(updated_job_post))
+    index_job_post(updated_job_post)
+    if update_data:
+        await invalidate_all_recommendations(db)
+    return JobPost(**updated_job_post)
 
-@router.delete("/{job_post_id}")
+@router.delete("/{job_post_id}", status_code=status.HTTP_202_ACCEPTED)
 async def delete_job_post(job_post_id: int, current_user: User = Depends(get_current_user), db = Depends(get_db)):
-    """Delete a job post."""
+    """Delete a job post; its applications are removed by a background job."""
     # Check if job post exists
     job_post = await db.job_posts.find_one({"_id": job_post_id})
     if not job_post:
@@ -181,8 +465,12 @@ async def delete_job_post(job_post_id: int, current_user: User = Depends(get_cur
     # Authorization: Only Admin or owner (Employer) can delete
     if current_user.role != "Admin" and job_post["user_id"] != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this job post")
+    # Queue the cascade first: if the delete below never happens, the job still removes the job post.
+    # All applications for this job post, with their CV files, are deleted in the background
+    job = await enqueue_job(db, DELETE_JOB_POST_JOB, {"job_post_id": job_post_id}, created_by=current_user.id)
     # Delete the job post
     await db.job_posts.delete_one({"_id": job_post_id})
-    # Delete all applications for this job post
-    await db.applications.delete_many({"job_post_id": job_post_id})
-    return {"message": f"Job post {job_post_id} deleted successfully"}
+    unindex_job_post(job_post_id)
+    invalidate_counts("job_posts")
+    invalidate_job_post_facets()
+    return {"message": f"Job post {job_post_id} deleted, removing its applications", "job_id": job["_id"]}
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.models.job import Job
+from app.models.user import User
+from app.utils.auth import get_current_user
+from database import get_db
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"],
+    responses={404: {"description": "Not found"}},
+)
+
+@router.get("/{job_id}", response_model=Job)
+async def read_job(job_id: int, current_user: User = Depends(get_current_user), db = Depends(get_db)):
+    """Get the status and progress of a background job."""
+    job = await db.jobs.find_one({"_id": job_id}, {"locked_by": 0, "locked_until": 0})
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with ID {job_id} not found"
+        )
+    # Authorization: Only Admin or the user who started the job
+    if current_user.role != "Admin" and job.get("created_by") != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this job")
+    return Job(**job)
@@ -1,14 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from typing import List, Optional
 from datetime import datetime
 
 from app.models.profile import Profile, ProfileCreate, ProfileUpdate
-from app.models.base import convert_object_id
-from app.utils.pagination import PaginatedResponse
+from app.utils.http_cache import conditional_resource, conditional_list
+from app.utils.pagination import PaginatedResponse, fetch_page, page_number, count_total, invalidate_counts
 from app.utils.sequences import get_next_sequence_value
+from app.utils.skills import index_profile, unindex_profile
+from app.models.recommendation import RecommendationFeed, FeedStatus
+from app.utils.recommendations import feed_status, request_refresh, invalidate_recommendations
 from app.models.user import User
 from app.utils.auth import get_current_user
 from database import db, get_db
+from pymongo.errors import DuplicateKeyError
 
 router = APIRouter(
     prefix="/profiles",
@@ -54,37 +58,56 @@ async def create_profile(
     profile_data["created_at"] = datetime.utcnow()
     
     # Insert into database
-    await db.profiles.insert_one(profile_data)
+    try:
+        await db.profiles.insert_one(profile_data)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Profile already exists for user {profile.user_id}"
+        )
+    invalidate_counts("profiles")
+    index_profile(profile_data)
+    await invalidate_recommendations(db, profile.user_id)
     
     # Retrieve and return the created profile
     created_profile = await db.profiles.find_one({"_id": next_id})
     
-    return Profile(**convert_object_id(created_profile))
+    return Profile(**created_profile)
 
 @router.get("/", response_model=PaginatedResponse[Profile])
 async def read_profiles(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    approximate_total: bool = False,
     db = Depends(get_db)
 ):
     """Get a paginated list of profiles."""
     # Get total count for pagination
-    total = await db.profiles.count_documents({})
+    total, total_is_approximate = await count_total(db.profiles, {}, include_total, approximate_total)
     
-    # Get paginated profiles
-    cursor = db.profiles.find().skip(skip).limit(limit)
-    profiles = await cursor.to_list(length=limit)
+    # Get paginated profiles (newest first)
+    profiles, next_cursor = await fetch_page(db.profiles, {}, skip, limit, cursor)
+    
+    not_modified = conditional_list(request, response, "profiles", profiles, total, next_cursor)
+    if not_modified:
+        return not_modified
     
     # Return paginated response
     return PaginatedResponse.create(
-        items=[Profile(**convert_object_id(profile)) for profile in profiles],
+        items=[Profile(**profile) for profile in profiles],
         total=total,
-        page=(skip // limit) + 1,
-        limit=limit
+        page=page_number(skip, limit, cursor),
+        limit=limit,
+        next_cursor=next_cursor,
+        total_is_approximate=total_is_approximate
     )
 
 @router.get("/{profile_id}", response_model=Profile)
-async def read_profile(profile_id: int, db = Depends(get_db)):
+async def read_profile(profile_id: int, request: Request, response: Response, db = Depends(get_db)):
     """Get a specific profile by ID."""
     profile = await db.profiles.find_one({"_id": profile_id})
     if not profile:
@@ -93,10 +116,13 @@ async def read_profile(profile_id: int, db = Depends(get_db)):
             detail=f"Profile with ID {profile_id} not found"
         )
     
-    return Profile(**convert_object_id(profile))
+    not_modified = conditional_resource(request, response, "profiles", profile)
+    if not_modified:
+        return not_modified
+    return Profile(**profile)
 
 @router.get("/user/{user_id}", response_model=Profile)
-async def read_profile_by_user(user_id: int, db = Depends(get_db)):
+async def read_profile_by_user(user_id: int, request: Request, response: Response, db = Depends(get_db)):
     """Get profile by user ID."""
     profile = await db.profiles.find_one({"user_id": user_id})
     if not profile:
@@ -105,7 +131,36 @@ async def read_profile_by_user(user_id: int, db = Depends(get_db)):
             detail=f"Profile not found for user {user_id}"
         )
     
-    return Profile(**convert_object_id(profile))
+    not_modified = conditional_resource(request, response, "profiles", profile)
+    if not_modified:
+        return not_modified
+    return Profile(**profile)
+
+@router.get("/user/{user_id}/recommendations", response_model=RecommendationFeed)
+async def read_recommendations(user_id: int, current_user: User = Depends(get_current_user), db = Depends(get_db)):
+    """Get the recommended job posts of a job seeker.
+
+    The feed is precomputed in the background and read with one lookup. A
+    stale or missing feed is served as stored while a refresh job runs.
+    """
+    if current_user.role != "Admin" and user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view these recommendations"
+        )
+    
+    feed = await db.recommendations.find_one({"_id": user_id})
+    feed_state = feed_status(feed)
+    job = None
+    if feed_state != FeedStatus.FRESH:
+        job = await request_refresh(db, user_id, created_by=current_user.id)
+    return RecommendationFeed(
+        user_id=user_id,
+        status=feed_state,
+        computed_at=feed.get("computed_at") if feed else None,
+        job_id=job["_id"] if job else None,
+        items=feed.get("items", []) if feed else []
+    )
 
 @router.put("/{profile_id}", response_model=Profile)
 async def update_profile(
@@ -139,7 +194,10 @@ async def update_profile(
     
     # Return updated profile
     updated_profile = await db.profiles.find_one({"_id": profile_id})
-    return Profile(**convert_object_id(updated_profile))
+    index_profile(updated_profile)
+    if update_data:
+        await invalidate_recommendations(db, updated_profile["user_id"])
+    return Profile(**updated_profile)
 
 @router.put("/user/{user_id}", response_model=Profile)
 async def update_profile_by_user(
@@ -173,7 +231,10 @@ async def update_profile_by_user(
     
     # Return updated profile
     updated_profile = await db.profiles.find_one({"user_id": user_id})
-    return Profile(**convert_object_id(updated_profile))
+    index_profile(updated_profile)
+    if update_data:
+        await invalidate_recommendations(db, user_id)
+    return Profile(**updated_profile)
 
 @router.delete("/{profile_id}")
 async def delete_profile(profile_id: int, current_user: User = Depends(get_current_user), db = Depends(get_db)):
@@ -193,6 +254,9 @@ async def delete_profile(profile_id: int, current_user: User = Depends(get_curre
     
     # Delete the profile
     await db.profiles.delete_one({"_id": profile_id})
+    invalidate_counts("profiles")
+    unindex_profile(profile["user_id"])
+    await db.recommendations.delete_one({"_id": profile["user_id"]})
     
     return {"message": f"Profile {profile_id} deleted successfully"}
 
@@ -214,5 +278,8 @@ async def delete_profile_by_user(user_id: int, current_user: User = Depends(get_
     
     # Delete the profile
     await db.profiles.delete_one({"user_id": user_id})
+    invalidate_counts("profiles")
+    unindex_profile(user_id)
+    await db.recommendations.delete_one({"_id": user_id})
     
     return {"message": f"Profile for user {user_id} deleted successfully"}
@@ -1,14 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from typing import List, Optional
 from datetime import datetime
 
 from app.models.user import User, UserCreate, UserUpdate, UserInDB, UserRole
-from app.utils.security import get_password_hash, verify_password
-from app.utils.pagination import PaginatedResponse
-from app.models.base import convert_object_id
+from app.utils.security import get_password_hash_async
+from app.utils.http_cache import conditional_resource, conditional_list
+from app.utils.pagination import PaginatedResponse, fetch_page, page_number, count_total, invalidate_counts
 from app.utils.sequences import get_next_sequence_value
+from app.utils.jobs import enqueue_job
+from app.utils.cascades import DELETE_USER_JOB
 from database import db, get_db
-from app.utils.auth import get_current_user
+from pymongo.errors import DuplicateKeyError
+from app.utils.auth import get_current_user, invalidate_user
 
 router = APIRouter(
     prefix="/users",
@@ -35,48 +38,60 @@ async def create_user(user: UserCreate, current_user: User = Depends(get_current
     # Create user object with hashed password
     user_in_db = UserInDB(
         **user.dict(),
-        hashed_password=get_password_hash(user.password),
+        hashed_password=await get_password_hash_async(user.password),
         created_at=datetime.utcnow(),
     )
     
     # Set the ID and insert into database
     user_data = user_in_db.dict(by_alias=True)
     user_data["_id"] = next_id
-    await db.users.insert_one(user_data)
+    try:
+        await db.users.insert_one(user_data)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Email {user.email} already registered"
+        )
+    invalidate_counts("users")
     
     # Retrieve and return the created user
     created_user = await db.users.find_one({"_id": next_id})
-    created_user = convert_object_id(created_user)
-    
     return User(**created_user)
 
 @router.get("/", response_model=PaginatedResponse[User])
 async def read_users(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    approximate_total: bool = False,
     db = Depends(get_db)
 ):
     """Get a paginated list of users."""
     # Get total count for pagination
-    total = await db.users.count_documents({})
+    total, total_is_approximate = await count_total(db.users, {}, include_total, approximate_total)
     
-    # Get paginated users
-    cursor = db.users.find().skip(skip).limit(limit)
-    users = await cursor.to_list(length=limit)
+    # Get paginated users (newest first)
+    users, next_cursor = await fetch_page(db.users, {}, skip, limit, cursor)
     
-    # Convert ObjectIds to strings
-    converted_users = [convert_object_id(user) for user in users]
+    not_modified = conditional_list(request, response, "users", users, total, next_cursor)
+    if not_modified:
+        return not_modified
     
     # Return paginated response
     return PaginatedResponse.create(
-        items=[User(**user) for user in converted_users],
+        items=[User(**user) for user in users],
         total=total,
-        page=(skip // limit) + 1,
-        limit=limit
+        page=page_number(skip, limit, cursor),
+        limit=limit,
+        next_cursor=next_cursor,
+        total_is_approximate=total_is_approximate
     )
 
 @router.get("/{user_id}", response_model=User)
-async def read_user(user_id: int, db = Depends(get_db)):
+async def read_user(user_id: int, request: Request, response: Response, db = Depends(get_db)):
     """Get a specific user by ID."""
     user = await db.users.find_one({"_id": user_id})
     if not user:
@@ -85,7 +100,9 @@ async def read_user(user_id: int, db = Depends(get_db)):
             detail=f"User with ID {user_id} not found"
         )
     
-    user = convert_object_id(user)
+    not_modified = conditional_resource(request, response, "users", user)
+    if not_modified:
+        return not_modified
     return User(**user)
 
 @router.put("/{user_id}", response_model=User)
@@ -113,24 +130,32 @@ async def update_user(user_id: int, user: UserUpdate, current_user: User = Depen
     # Update user
     update_data = user.dict(exclude_unset=True, by_alias=True)
     if user.password:
-        update_data["hashed_password"] = get_password_hash(user.password)
+        update_data["hashed_password"] = await get_password_hash_async(user.password)
         update_data.pop("password", None)
     
     if update_data:
         update_data["updated_at"] = datetime.utcnow()
-        await db.users.update_one(
-            {"_id": user_id},
-            {"$set": update_data}
-        )
+        try:
+            await db.users.update_one(
+                {"_id": user_id},
+                {"$set": update_data}
+            )
+        except DuplicateKeyError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Email {user.email} already registered"
+            )
+        # Role or details changed: drop the cached copy used for authentication
+        invalidate_user(user_id)
+        invalidate_counts("users")
     
     # Return updated user
     updated_user = await db.users.find_one({"_id": user_id})
-    updated_user = convert_object_id(updated_user)
     return User(**updated_user)
 
-@router.delete("/{user_id}")
+@router.delete("/{user_id}", status_code=status.HTTP_202_ACCEPTED)
 async def delete_user(user_id: int, current_user: User = Depends(get_current_user), db = Depends(get_db)):
-    """Delete a user."""
+    """Delete a user; their job posts, applications and profile are removed by a background job."""
     if current_user.role != "Admin" and user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this user")
     
@@ -142,39 +167,46 @@ async def delete_user(user_id: int, current_user: User = Depends(get_current_use
             detail=f"User with ID {user_id} not found"
         )
     
+    # Queue the cascade first: if the delete below never happens, the job still removes the user.
+    # Job posts (with their applications), applications and profile go in the background
+    job = await enqueue_job(db, DELETE_USER_JOB, {"user_id": user_id}, created_by=current_user.id)
+    
     # Delete user
     await db.users.delete_one({"_id": user_id})
+    invalidate_user(user_id)
+    invalidate_counts("users")
     
-    # Delete all job posts by this user
-    await db.job_posts.delete_many({"user_id": user_id})
-    
-    # Delete all applications by this user
-    await db.applications.delete_many({"user_id": user_id})
-    
-    return {"message": f"User {user_id} deleted successfully"}
+    return {"message": f"User {user_id} deleted, removing related data", "job_id": job["_id"]}
 
 @router.get("/role/{role}", response_model=PaginatedResponse[User])
 async def read_users_by_role(
+    request: Request,
+    response: Response,
     role: UserRole,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    approximate_total: bool = False,
     db = Depends(get_db)
 ):
     """Get users by role."""
     # Get total count for pagination
-    total = await db.users.count_documents({"role": role})
+    total, total_is_approximate = await count_total(db.users, {"role": role}, include_total, approximate_total)
     
-    # Get paginated users
-    cursor = db.users.find({"role": role}).skip(skip).limit(limit)
-    users = await cursor.to_list(length=limit)
+    # Get paginated users (newest first)
+    users, next_cursor = await fetch_page(db.users, {"role": role}, skip, limit, cursor)
     
-    # Convert ObjectIds to strings
-    converted_users = [convert_object_id(user) for user in users]
+    not_modified = conditional_list(request, response, "users", users, total, next_cursor)
+    if not_modified:
+        return not_modified
     
     # Return paginated response
     return PaginatedResponse.create(
-        items=[User(**user) for user in converted_users],
+        items=[User(**user) for user in users],
         total=total,
-        page=(skip // limit) + 1,
-        limit=limit
+        page=page_number(skip, limit, cursor),
+        limit=limit,
+        next_cursor=next_cursor,
+        total_is_approximate=total_is_approximate
     )
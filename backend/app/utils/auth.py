@@ -1,14 +1,16 @@
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
+import hmac
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 import os
 from dotenv import load_dotenv
 
 from app.models.user import User, UserInDB
-from app.models.base import convert_object_id
-from app.utils.security import verify_password
+from app.utils.security import verify_password_async
+from app.utils.cache import TTLCache
 from database import db, get_db
 
 # Load environment variables
@@ -22,6 +24,44 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 # OAuth2 password bearer for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+# Authenticated-user caches: decoded tokens (token -> user id) and user records
+# (user id -> User). Entries are evicted by invalidate_user() on every user write;
+# the TTL bounds staleness across processes that did not see the write.
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", 30))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", 4096))
+
+# Static bearer token for the monitoring endpoints, so a Prometheus scraper needs no user login
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+token_cache = TTLCache("auth_tokens", maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+user_cache = TTLCache("auth_users", maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+
+def invalidate_user(user_id: int):
+    """Evict a user record so the next request reloads its role and details.
+
+    Cached tokens only map to a user id, so they stay valid: a deleted user's
+    token fails on the reload instead.
+    """
+    user_cache.invalidate(user_id)
+
+def _decode_token(token: str) -> Optional[int]:
+    """Return the user id carried by a token, or None when it is invalid."""
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        user_id = payload.get("sub")
+        if user_id is None:
+            return None
+        user_id = int(user_id)
+    except (JWTError, ValueError):
+        return None
+    # Never keep a token cached past its own expiry
+    expires = payload.get("exp")
+    ttl = expires - time.time() if expires else None
+    token_cache.set(token, user_id, ttl=ttl)
+    return user_id
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -50,14 +90,12 @@ async def authenticate_user(email: str, password: str, db = Depends(get_db)):
         return False
     
     # Verify password
-    if not verify_password(password, user["hashed_password"]):
+    if not await verify_password_async(password, user["hashed_password"]):
         print(f"❌ Password verification failed for user: {email}")  # Debug log
         return False
     
     print(f"✅ Password verified for user: {email}")  # Debug log
     
-    # Convert and return User object
-    user = convert_object_id(user)
     return User(**user)
 
 async def get_current_user(token: str = Depends(oauth2_scheme), db = Depends(get_db)):
@@ -67,24 +105,23 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db = Depends(get
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        # Decode JWT token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-        # Convert user_id to integer
-        user_id = int(user_id)
-    except (JWTError, ValueError):
+    # Decode JWT token
+    user_id = _decode_token(token)
+    if user_id is None:
         raise credentials_exception
     
+    cached_user = user_cache.get(user_id)
+    if cached_user is not None:
+        return cached_user
+    
     # Get user from database
     user = await db.users.find_one({"_id": user_id})
     if user is None:
         raise credentials_exception
     
-    user = convert_object_id(user)
-    return User(**user)
+    user = User(**user)
+    user_cache.set(user_id, user)
+    return user
 
 # Check if user is an admin
 async def get_current_admin(current_user: User = Depends(get_current_user)):
@@ -96,6 +133,16 @@ async def get_current_admin(current_user: User = Depends(get_current_user)):
         )
     return current_user
 
+# Check access to the monitoring endpoints
+async def get_metrics_reader(token: str = Depends(oauth2_scheme)):
+    """Allow the METRICS_TOKEN bearer token or an admin's JWT.
+
+    The token check needs no database, so metrics stay readable during an outage.
+    """
+    if METRICS_TOKEN and hmac.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+        return None
+    return await get_current_admin(await get_current_user(token, await get_db()))
+
 # Check if user is an employer
 async def get_current_employer(current_user: User = Depends(get_current_user)):
     """Check if current user is an employer."""
@@ -0,0 +1,46 @@
+from typing import Dict
+from fastapi import HTTPException, status
+
+class BodySizeLimitMiddleware:
+    """ASGI middleware capping the request body size of selected paths.
+
+    FastAPI reads and parses the whole body (spooling multipart files to disk)
+    before the endpoint or its dependencies run, so a check in the endpoint
+    comes too late. This wraps `receive` instead: a declared Content-Length
+    over the limit fails on the first read, before any body is received, and
+    chunked bodies fail as soon as the running total passes the limit. The
+    413 is raised inside the app, so it gets the usual error and CORS handling.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits  # exact request path -> maximum body bytes
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        declared = dict(scope["headers"]).get(b"content-length", b"")
+        too_large = declared.isdigit() and int(declared) > limit
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            if too_large:
+                raise _too_large(limit)
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise _too_large(limit)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+def _too_large(limit: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Request body must not exceed {limit // 1024} KB"
+    )
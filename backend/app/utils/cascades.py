@@ -0,0 +1,86 @@
+"""Background jobs that remove the documents belonging to a deleted user or job post.
+
+The DELETE routes enqueue one of these jobs and then remove the user or job
+post itself. The job deletes the parent again before anything else (a no-op
+when the route got there first), so a request that fails between the two
+steps still ends with everything removed, and no new applications or job
+posts can be attached once the children are being deleted. Each step deletes
+in batches by filter, so a retried or taken-over job simply continues where
+data is left.
+"""
+import os
+from app.utils.jobs import job_handler, JobContext
+from app.utils.auth import invalidate_user
+from app.utils.cv_storage import delete_application_cvs
+from app.utils.pagination import invalidate_counts
+from app.utils.facets import invalidate_job_post_facets
+from app.utils.skills import unindex_job_post, unindex_profile
+from app.utils.recommendations import drop_job_posts_from_feeds
+
+DELETE_USER_JOB = "delete_user"
+DELETE_JOB_POST_JOB = "delete_job_post"
+
+# Documents removed per delete_many call
+CASCADE_BATCH_SIZE = int(os.getenv("CASCADE_BATCH_SIZE", 500))
+
+async def _next_ids(collection, filter_query: dict):
+    documents = await collection.find(filter_query, {"_id": 1}).limit(CASCADE_BATCH_SIZE).to_list(length=CASCADE_BATCH_SIZE)
+    return [document["_id"] for document in documents]
+
+async def _delete_applications(ctx: JobContext, filter_query: dict):
+    """Delete matching applications and their CV files, one batch at a time."""
+    db = ctx.db
+    while True:
+        ids = await _next_ids(db.applications, filter_query)
+        if not ids:
+            return
+        await delete_application_cvs(db, {"_id": {"$in": ids}})
+        result = await db.applications.delete_many({"_id": {"$in": ids}})
+        invalidate_counts("applications")
+        await ctx.report(applications=ctx.progress.get("applications", 0) + result.deleted_count)
+
+@job_handler(DELETE_JOB_POST_JOB)
+async def delete_job_post_cascade(ctx: JobContext):
+    """Delete a job post, if the route did not already, and its applications."""
+    db = ctx.db
+    job_post_id = ctx.params["job_post_id"]
+    result = await db.job_posts.delete_one({"_id": job_post_id})
+    if result.deleted_count:
+        unindex_job_post(job_post_id)
+        invalidate_counts("job_posts")
+        invalidate_job_post_facets()
+    await drop_job_posts_from_feeds(db, [job_post_id])
+    await _delete_applications(ctx, {"job_post_id": job_post_id})
+
+@job_handler(DELETE_USER_JOB)
+async def delete_user_cascade(ctx: JobContext):
+    """Delete a user, if the route did not already, with their job posts (and their applications), applications, profile and feed."""
+    db = ctx.db
+    user_id = ctx.params["user_id"]
+    result = await db.users.delete_one({"_id": user_id})
+    if result.deleted_count:
+        invalidate_user(user_id)
+        invalidate_counts("users")
+
+    # Job posts first, each batch after the applications submitted to it
+    while True:
+        job_post_ids = await _next_ids(db.job_posts, {"user_id": user_id})
+        if not job_post_ids:
+            break
+        await _delete_applications(ctx, {"job_post_id": {"$in": job_post_ids}})
+        result = await db.job_posts.delete_many({"_id": {"$in": job_post_ids}})
+        for job_post_id in job_post_ids:
+            unindex_job_post(job_post_id)
+        await drop_job_posts_from_feeds(db, job_post_ids)
+        invalidate_counts("job_posts")
+        invalidate_job_post_facets()
+        await ctx.report(job_posts=ctx.progress.get("job_posts", 0) + result.deleted_count)
+
+    # Applications the user submitted as a job seeker
+    await _delete_applications(ctx, {"user_id": user_id})
+
+    result = await db.profiles.delete_many({"user_id": user_id})
+    invalidate_counts("profiles")
+    unindex_profile(user_id)
+    await db.recommendations.delete_one({"_id": user_id})
+    await ctx.report(profiles=ctx.progress.get("profiles", 0) + result.deleted_count)
@@ -0,0 +1,147 @@
+import base64
+import binascii
+import hashlib
+import os
+from bson import ObjectId
+from dotenv import load_dotenv
+from fastapi import HTTPException, UploadFile, status
+from gridfs.errors import NoFile
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+
+# Load environment variables
+load_dotenv()
+
+# CV files live in GridFS (cvs.files / cvs.chunks); applications keep a reference
+CV_BUCKET = "cvs"
+CV_MAX_BYTES = int(os.getenv("CV_MAX_BYTES", 5 * 1024 * 1024))
+CV_CHUNK_SIZE = 255 * 1024  # GridFS default chunk size
+
+# Leading bytes of the accepted CV formats
+CV_SIGNATURES = [
+    (b"%PDF-", "application/pdf"),
+    (b"PK\x03\x04", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "application/msword"),
+    (b"{\\rtf", "application/rtf"),
+]
+
+def get_cv_bucket(db):
+    return AsyncIOMotorGridFSBucket(db, bucket_name=CV_BUCKET)
+
+def decode_cv_data(cv_data: str) -> bytes:
+    """Decode a base64 CV sent in a JSON body (data: URL prefixes are accepted)."""
+    if cv_data.startswith("data:") and "," in cv_data:
+        cv_data = cv_data.split(",", 1)[1]
+    try:
+        return base64.b64decode(cv_data, validate=True)
+    except (binascii.Error, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cv_data must be base64 encoded"
+        )
+
+def sniff_cv_content_type(head: bytes) -> str:
+    """Detect the CV format from its first bytes, rejecting anything else."""
+    for signature, content_type in CV_SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="CV must be a PDF, Word or RTF document"
+    )
+
+def _too_large():
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"CV must not exceed {CV_MAX_BYTES // 1024} KB"
+    )
+
+async def store_cv(db, data: bytes, filename: str, content_type: str) -> dict:
+    """Store a CV in GridFS and return the reference fields for the application."""
+    if len(data) > CV_MAX_BYTES:
+        raise _too_large()
+    file_id = str(ObjectId())
+    digest = hashlib.sha256(data).hexdigest()
+    await get_cv_bucket(db).upload_from_stream_with_id(
+        file_id,
+        filename,
+        data,
+        metadata={"content_type": content_type, "sha256": digest}
+    )
+    return {"cv_file_id": file_id, "cv_size": len(data), "cv_sha256": digest}
+
+async def store_cv_upload(db, upload: UploadFile) -> dict:
+    """Copy an uploaded CV into GridFS chunk by chunk.
+
+    At most one chunk is held in memory, whatever the file size. The format is
+    sniffed from the first chunk and uploads over CV_MAX_BYTES are aborted.
+    Returns the reference fields plus the detected cv_content_type.
+    """
+    file_id = str(ObjectId())
+    digest = hashlib.sha256()
+    size = 0
+    grid_in = None
+    try:
+        while True:
+            chunk = await upload.read(CV_CHUNK_SIZE)
+            if not chunk:
+                break
+            if grid_in is None:
+                content_type = sniff_cv_content_type(chunk)
+                grid_in = get_cv_bucket(db).open_upload_stream_with_id(
+                    file_id,
+                    upload.filename or "cv",
+                    chunk_size_bytes=CV_CHUNK_SIZE
+                )
+            size += len(chunk)
+            if size > CV_MAX_BYTES:
+                raise _too_large()
+            digest.update(chunk)
+            await grid_in.write(chunk)
+        if grid_in is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="CV file is empty"
+            )
+        await grid_in.set("metadata", {"content_type": content_type, "sha256": digest.hexdigest()})
+        await grid_in.close()
+    except Exception:
+        if grid_in is not None:
+            await grid_in.abort()
+        raise
+    return {
+        "cv_file_id": file_id,
+        "cv_size": size,
+        "cv_sha256": digest.hexdigest(),
+        "cv_content_type": content_type,
+    }
+
+async def open_cv(db, file_id: str):
+    """Open a stored CV for reading, or None when it does not exist."""
+    try:
+        return await get_cv_bucket(db).open_download_stream(file_id)
+    except NoFile:
+        return None
+
+async def iter_cv(grid_out):
+    """Yield a stored CV chunk by chunk."""
+    while True:
+        chunk = await grid_out.readchunk()
+        if not chunk:
+            break
+        yield chunk
+
+async def delete_cv(db, file_id: str):
+    """Delete a stored CV; missing files are ignored."""
+    try:
+        await get_cv_bucket(db).delete(file_id)
+    except NoFile:
+        pass
+
+async def delete_application_cvs(db, filter_query: dict):
+    """Delete the CV files of every application matching the filter."""
+    cursor = db.applications.find(
+        {**filter_query, "cv_file_id": {"$ne": None}},
+        {"cv_file_id": 1}
+    )
+    async for application in cursor:
+        await delete_cv(db, application["cv_file_id"])
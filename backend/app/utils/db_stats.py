@@ -0,0 +1,49 @@
+import asyncio
+import os
+from datetime import datetime
+from pymongo.errors import OperationFailure
+from app.utils.cache import TTLCache
+
+# Seconds the /db-info statistics are reused before they are collected again
+DB_INFO_TTL = float(os.getenv("DB_INFO_TTL", 30))
+db_info_cache = TTLCache("db_info", maxsize=1, ttl=DB_INFO_TTL)
+
+async def collection_stats(collection) -> dict:
+    """Storage statistics of one collection from its metadata, without counting documents."""
+    try:
+        cursor = collection.aggregate([{"$collStats": {"storageStats": {}}}])
+        stats = (await cursor.to_list(length=1))[0]["storageStats"]
+    except (OperationFailure, IndexError, KeyError):
+        # Views and restricted users have no storage stats; fall back to the metadata count
+        try:
+            return {"count": await collection.estimated_document_count()}
+        except OperationFailure:
+            # Views have no metadata count either; count through the view's pipeline
+            return {"count": await collection.count_documents({})}
+    return {
+        "count": stats.get("count", 0),
+        "size_bytes": stats.get("size", 0),
+        "storage_size_bytes": stats.get("storageSize", 0),
+        "avg_obj_size_bytes": stats.get("avgObjSize", 0),
+        "total_index_size_bytes": stats.get("totalIndexSize", 0),
+        "index_sizes": stats.get("indexSizes", {}),
+    }
+
+async def database_info(db) -> dict:
+    """Collection statistics for /db-info, gathered concurrently and cached for DB_INFO_TTL."""
+    info = db_info_cache.get("info")
+    if info is not None:
+        return info
+    collections = sorted(await db.list_collection_names())
+    results = await asyncio.gather(*(collection_stats(db[name]) for name in collections), return_exceptions=True)
+    # One unreadable collection reports a null count instead of failing the whole page
+    stats = [{"count": None} if isinstance(result, Exception) else result for result in results]
+    info = {
+        "database_name": db.name,
+        "collections": collections,
+        "collection_counts": {name: stat["count"] for name, stat in zip(collections, stats)},
+        "collection_stats": dict(zip(collections, stats)),
+        "collected_at": datetime.utcnow().isoformat(),
+    }
+    db_info_cache.set("info", info)
+    return info
@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+import os
+from typing import AsyncIterator, List
+from app.utils.pagination import KEYSET_SORT
+
+# Applications read from the cursor, and joined with profiles, per round trip
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 500))
+
+# Application fields, then the applicant's profile fields, in export column order
+EXPORT_APPLICATION_FIELDS = ["_id", "user_id", "job_post_id", "status", "cv_filename", "cv_size", "created_at", "updated_at"]
+EXPORT_PROFILE_FIELDS = ["full_name", "phone", "age", "gender", "skills", "education", "experience"]
+EXPORT_COLUMNS = EXPORT_APPLICATION_FIELDS + EXPORT_PROFILE_FIELDS
+
+async def _join_profiles(db, applications: List[dict]) -> List[dict]:
+    """Add the profile fields of each applicant, with one $in lookup for the batch."""
+    user_ids = list({application["user_id"] for application in applications})
+    projection = {field: 1 for field in EXPORT_PROFILE_FIELDS}
+    projection["user_id"] = 1
+    profiles = {
+        profile["user_id"]: profile
+        async for profile in db.profiles.find({"user_id": {"$in": user_ids}}, projection)
+    }
+    rows = []
+    for application in applications:
+        profile = profiles.get(application["user_id"], {})
+        row = {field: application.get(field) for field in EXPORT_APPLICATION_FIELDS}
+        row.update({field: profile.get(field) for field in EXPORT_PROFILE_FIELDS})
+        rows.append(row)
+    return rows
+
+async def iter_application_batches(db, filter_query: dict) -> AsyncIterator[List[dict]]:
+    """Yield export rows in batches; only one batch is held in memory at a time."""
+    projection = {field: 1 for field in EXPORT_APPLICATION_FIELDS}
+    cursor = db.applications.find(filter_query, projection).sort(KEYSET_SORT).batch_size(EXPORT_BATCH_SIZE)
+    batch = []
+    async for application in cursor:
+        batch.append(application)
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield await _join_profiles(db, batch)
+            batch = []
+    if batch:
+        yield await _join_profiles(db, batch)
+
+# Leading characters that make spreadsheet applications evaluate a cell as a formula
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        value = "; ".join(str(item) for item in value)
+    elif hasattr(value, "isoformat"):
+        return value.isoformat()
+    # Text comes from applicants' profiles; quote it so Excel shows it instead of running it
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+async def stream_csv(db, filter_query: dict) -> AsyncIterator[bytes]:
+    """CSV export with a header row, encoded one batch at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue().encode()
+    async for rows in iter_application_batches(db, filter_query):
+        buffer.seek(0)
+        buffer.truncate()
+        for row in rows:
+            writer.writerow([_csv_value(row[column]) for column in EXPORT_COLUMNS])
+        yield buffer.getvalue().encode()
+
+async def stream_ndjson(db, filter_query: dict) -> AsyncIterator[bytes]:
+    """Newline-delimited JSON export, one object per application."""
+    async for rows in iter_application_batches(db, filter_query):
+        yield "".join(json.dumps(row, default=str) + "\n" for row in rows).encode()
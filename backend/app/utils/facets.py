@@ -0,0 +1,72 @@
+import json
+import os
+from dotenv import load_dotenv
+from app.utils.cache import TTLCache
+
+# Load environment variables
+load_dotenv()
+
+FACET_CACHE_TTL = float(os.getenv("FACET_CACHE_TTL", 30))
+FACET_LOCATION_LIMIT = int(os.getenv("FACET_LOCATION_LIMIT", 20))
+
+# Lower bounds of the salary buckets (on salary_max); the last bucket is open-ended
+SALARY_BUCKETS = [0, 5_000_000, 10_000_000, 15_000_000, 20_000_000, 30_000_000]
+
+# Facet counts per normalized filter, dropped whenever a job post is written
+facet_cache = TTLCache("job_post_facets", maxsize=256, ttl=FACET_CACHE_TTL)
+
+def job_post_facet_pipeline(filter_query: dict) -> list:
+    """Aggregation computing every job post facet in a single pass."""
+    return [
+        {"$match": filter_query},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "job_type": [
+                {"$group": {"_id": "$job_type", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1, "_id": 1}},
+            ],
+            "location": [
+                {"$group": {"_id": "$location", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1, "_id": 1}},
+                {"$limit": FACET_LOCATION_LIMIT},
+            ],
+            "salary": [
+                {"$bucket": {
+                    "groupBy": "$salary_max",
+                    "boundaries": SALARY_BUCKETS,
+                    # Everything from the last boundary up lands in the open bucket
+                    "default": "open",
+                    "output": {"count": {"$sum": 1}},
+                }},
+            ],
+        }},
+    ]
+
+def _salary_bucket(row: dict) -> dict:
+    if row["_id"] == "open":
+        return {"min": SALARY_BUCKETS[-1], "max": None, "count": row["count"]}
+    index = SALARY_BUCKETS.index(row["_id"])
+    return {"min": row["_id"], "max": SALARY_BUCKETS[index + 1], "count": row["count"]}
+
+async def get_job_post_facets(db, filter_query: dict) -> dict:
+    """Facet counts for the job posts matching the filter, cached briefly."""
+    key = json.dumps(filter_query, sort_keys=True, default=str)
+    facets = facet_cache.get(key)
+    if facets is not None:
+        return facets
+    
+    result = await db.job_posts.aggregate(job_post_facet_pipeline(filter_query)).to_list(length=1)
+    result = result[0] if result else {}
+    total = result.get("total") or [{"count": 0}]
+    facets = {
+        "total": total[0]["count"],
+        "job_type": [{"value": row["_id"], "count": row["count"]} for row in result.get("job_type", [])],
+        "location": [{"value": row["_id"], "count": row["count"]} for row in result.get("location", [])],
+        "salary": [_salary_bucket(row) for row in result.get("salary", [])],
+    }
+    facet_cache.set(key, facets)
+    return facets
+
+def invalidate_job_post_facets():
+    """Drop cached facets after any job post insert, update or delete."""
+    facet_cache.clear()
@@ -0,0 +1,79 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional
+from fastapi import Request, Response, status
+
+def _version(document: dict) -> Optional[datetime]:
+    """When a document last changed, as stored by the routes."""
+    return document.get("updated_at") or document.get("created_at")
+
+def _digest(*parts) -> str:
+    return hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+
+def _as_utc(value: datetime) -> datetime:
+    # Mongo returns naive datetimes in UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison, as required for If-None-Match."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+def _not_modified(headers: dict) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+def conditional_resource(request: Request, response: Response, collection: str, document: dict, *extra) -> Optional[Response]:
+    """Validators for a single document, answering 304 when the client copy is current.
+
+    The strong ETag is derived from the collection, _id and version timestamp
+    (plus any extra representation inputs, e.g. joined owner fields), so it can
+    be checked before the response model is built. Returns the 304 response to
+    send, or None after setting ETag/Last-Modified on `response`.
+    """
+    version = _version(document)
+    etag = '"' + _digest(collection, document.get("_id"), version.isoformat() if version else "", *extra) + '"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    last_modified = None
+    if version is not None:
+        last_modified = _as_utc(version).replace(microsecond=0)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(headers)
+    elif last_modified is not None and request.headers.get("if-modified-since"):
+        try:
+            since = parsedate_to_datetime(request.headers["if-modified-since"])
+        except (TypeError, ValueError):
+            since = None
+        if since is not None and last_modified <= _as_utc(since):
+            return _not_modified(headers)
+    
+    response.headers.update(headers)
+    return None
+
+def conditional_list(request: Request, response: Response, collection: str, documents: Iterable[dict], *extra) -> Optional[Response]:
+    """Weak ETag for a list page, built from the ids and versions of its rows.
+
+    `extra` should carry everything else in the body (total, next cursor...).
+    Lists get no Last-Modified: a deleted row would not move it forward.
+    """
+    rows = [(document.get("_id"), _version(document)) for document in documents]
+    etag = 'W/"' + _digest(collection, rows, *extra) + '"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _etag_matches(if_none_match, etag):
+        return _not_modified(headers)
+    response.headers.update(headers)
+    return None
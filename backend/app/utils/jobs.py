@@ -0,0 +1,207 @@
+import asyncio
+import os
+import traceback
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+from pymongo import ReturnDocument
+from dotenv import load_dotenv
+from app.models.job import JobStatus
+from app.utils.sequences import get_next_sequence_value
+
+# Load environment variables
+load_dotenv()
+
+# Number of asyncio workers per process and how often idle workers poll for jobs
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 2))
+# A claimed job is taken over by another worker when its lock is not renewed in time
+JOB_LOCK_SECONDS = float(os.getenv("JOB_LOCK_SECONDS", 300))
+# Failed jobs are retried until they were attempted this many times
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+
+# Identifies the locks held by this process
+WORKER_ID = uuid.uuid4().hex
+
+class JobContext:
+    """Handed to a job handler to report progress on the job document."""
+
+    def __init__(self, db, job: dict):
+        self.db = db
+        self.job = job
+        self.params = job.get("params", {})
+        self.progress = dict(job.get("progress") or {})
+
+    async def report(self, **progress):
+        """Store progress counters and renew the lock on the job."""
+        self.progress.update(progress)
+        await self.db.jobs.update_one(
+            {"_id": self.job["_id"], "locked_by": self.job["locked_by"]},
+            {"$set": {
+                "progress": self.progress,
+                "locked_until": datetime.utcnow() + timedelta(seconds=JOB_LOCK_SECONDS),
+                "updated_at": datetime.utcnow(),
+            }}
+        )
+
+JobHandler = Callable[[JobContext], Awaitable[None]]
+
+# Job type -> coroutine that performs it
+_handlers: Dict[str, JobHandler] = {}
+_workers: List[asyncio.Task] = []
+_wakeup: Optional[asyncio.Event] = None
+
+def job_handler(job_type: str):
+    """Register the decorated coroutine as the handler of a job type.
+
+    Handlers must be safe to run again from the start: a job is retried after
+    a failure and taken over when the worker running it dies.
+    """
+    def register(handler: JobHandler) -> JobHandler:
+        _handlers[job_type] = handler
+        return handler
+    return register
+
+async def enqueue_job(db, job_type: str, params: dict, created_by: Optional[int] = None) -> dict:
+    """Store a queued job and wake up the local workers."""
+    if job_type not in _handlers:
+        raise ValueError(f"Unknown job type {job_type}")
+    now = datetime.utcnow()
+    job = {
+        "_id": await get_next_sequence_value("jobs"),
+        "type": job_type,
+        "params": params,
+        "status": JobStatus.QUEUED.value,
+        "progress": {},
+        "attempts": 0,
+        "error": None,
+        "created_by": created_by,
+        "created_at": now,
+        "updated_at": now,
+    }
+    await db.jobs.insert_one(job)
+    if _wakeup is not None:
+        _wakeup.set()
+    return job
+
+async def claim_job(db) -> Optional[dict]:
+    """Atomically take the oldest runnable job, or None when the queue is empty."""
+    now = datetime.utcnow()
+    return await db.jobs.find_one_and_update(
+        {"$or": [
+            {"status": JobStatus.QUEUED.value},
+            # The worker holding this job stopped renewing its lock; jobs that used up
+            # their attempts this way are failed by fail_abandoned_jobs instead
+            {"status": JobStatus.RUNNING.value, "locked_until": {"$lt": now}, "attempts": {"$lt": JOB_MAX_ATTEMPTS}},
+        ]},
+        {
+            "$set": {
+                "status": JobStatus.RUNNING.value,
+                "locked_by": WORKER_ID,
+                "locked_until": now + timedelta(seconds=JOB_LOCK_SECONDS),
+                "started_at": now,
+                "updated_at": now,
+            },
+            "$inc": {"attempts": 1},
+        },
+        sort=[("created_at", 1), ("_id", 1)],
+        return_document=ReturnDocument.AFTER
+    )
+
+async def fail_abandoned_jobs(db) -> int:
+    """Fail running jobs whose lock expired on their last attempt.
+
+    A handler that kills or hangs its worker never reaches run_job's error
+    handling, so without this such a job would be taken over forever.
+    """
+    now = datetime.utcnow()
+    result = await db.jobs.update_many(
+        {"status": JobStatus.RUNNING.value, "locked_until": {"$lt": now}, "attempts": {"$gte": JOB_MAX_ATTEMPTS}},
+        {
+            "$set": {
+                "status": JobStatus.FAILED.value,
+                "error": f"Worker stopped responding on attempt {JOB_MAX_ATTEMPTS} of {JOB_MAX_ATTEMPTS}",
+                "finished_at": now,
+                "updated_at": now,
+            },
+            "$unset": {"locked_by": "", "locked_until": ""},
+        }
+    )
+    return result.modified_count
+
+async def _finish(db, job: dict, update: dict):
+    update["updated_at"] = datetime.utcnow()
+    await db.jobs.update_one(
+        {"_id": job["_id"], "locked_by": job["locked_by"]},
+        {"$set": update, "$unset": {"locked_by": "", "locked_until": ""}}
+    )
+
+async def run_job(db, job: dict):
+    """Run a claimed job and record its outcome."""
+    handler = _handlers.get(job["type"])
+    if handler is None:
+        await _finish(db, job, {
+            "status": JobStatus.FAILED.value,
+            "error": f"Unknown job type {job['type']}",
+            "finished_at": datetime.utcnow(),
+        })
+        return
+    context = JobContext(db, job)
+    try:
+        await handler(context)
+    except asyncio.CancelledError:
+        # Shutting down: leave the job to be taken over once the lock expires
+        raise
+    except Exception as e:
+        print(f"Job {job['_id']} ({job['type']}) failed: {e}")
+        traceback.print_exc()
+        if job["attempts"] < JOB_MAX_ATTEMPTS:
+            await _finish(db, job, {"status": JobStatus.QUEUED.value, "error": str(e), "progress": context.progress})
+        else:
+            await _finish(db, job, {
+                "status": JobStatus.FAILED.value,
+                "error": str(e),
+                "progress": context.progress,
+                "finished_at": datetime.utcnow(),
+            })
+        return
+    await _finish(db, job, {
+        "status": JobStatus.COMPLETED.value,
+        "error": None,
+        "progress": context.progress,
+        "finished_at": datetime.utcnow(),
+    })
+
+async def _worker(db):
+    while True:
+        try:
+            await fail_abandoned_jobs(db)
+            job = await claim_job(db)
+        except Exception as e:
+            print(f"Could not claim a job: {e}")
+            job = None
+        if job is not None:
+            await run_job(db, job)
+            continue
+        # Idle: wait for a local enqueue or poll again for jobs from other processes
+        _wakeup.clear()
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=JOB_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+def start_job_workers(db):
+    """Start JOB_WORKERS workers on the running event loop."""
+    global _wakeup
+    if _workers:
+        return
+    _wakeup = asyncio.Event()
+    for _ in range(JOB_WORKERS):
+        _workers.append(asyncio.create_task(_worker(db)))
+
+async def stop_job_workers():
+    """Cancel the workers; interrupted jobs are resumed after their lock expires."""
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
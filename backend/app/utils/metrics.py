@@ -0,0 +1,287 @@
+"""Process metrics exposed at /metrics in the Prometheus text format.
+
+HTTP requests are measured by MetricsMiddleware, MongoDB commands and pool
+checkouts by pymongo listeners registered on the client in database.py.
+pymongo calls its listeners from driver threads, so every metric is guarded
+by a lock.
+"""
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from pymongo import monitoring
+from starlette.routing import Match
+
+from app.utils.cache import cache_stats
+from app.utils.security import hash_pool_stats
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        registry.append(self)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.label_names, key)} {_number(value)}" for key, value in values]
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, *args, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple, list] = {}  # labels -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, *labels):
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[index] += 1
+                    break
+            entry[-2] += value
+            entry[-1] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = [(key, list(entry)) for key, entry in self._values.items()]
+        lines = self.header()
+        for key, entry in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets, entry):
+                cumulative += count
+                bucket = _labels(self.label_names, key, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{bucket} {cumulative}")
+            bucket = _labels(self.label_names, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{bucket} {entry[-1]}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(entry[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {entry[-1]}")
+        return lines
+
+registry: List[_Metric] = []
+# Callables returning extra (name, type, documentation, [(labels dict, value)]) families at scrape time
+_collectors: List[Callable[[], Iterable[Tuple[str, str, str, List[Tuple[dict, float]]]]]] = []
+
+def register_collector(collector: Callable):
+    """Add a callable whose samples are read on every scrape, e.g. cache counters."""
+    _collectors.append(collector)
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in registry:
+        lines.extend(metric.render())
+    for collector in _collectors:
+        for name, metric_type, documentation, samples in collector():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in samples:
+                names = tuple(labels)
+                lines.append(f"{name}{_labels(names, tuple(labels[n] for n in names))} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+http_requests_total = Counter("http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+http_request_duration_seconds = Histogram("http_request_duration_seconds", "HTTP request latency.", ("method", "route"))
+http_requests_in_progress = Gauge("http_requests_in_progress", "HTTP requests being served.", ("method", "route"))
+mongodb_command_duration_seconds = Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command duration as measured by the driver.", ("collection", "command")
+)
+mongodb_command_failures_total = Counter(
+    "mongodb_command_failures_total", "MongoDB commands that returned an error.", ("collection", "command")
+)
+mongodb_pool_checkout_wait_seconds = Histogram(
+    "mongodb_pool_checkout_wait_seconds", "Time spent waiting for a pooled MongoDB connection."
+)
+mongodb_pool_checkout_failures_total = Counter(
+    "mongodb_pool_checkout_failures_total", "Connection checkouts that failed.", ("reason",)
+)
+
+class MetricsMiddleware:
+    """ASGI middleware counting and timing requests per route template.
+
+    Requests are labelled with the path template (e.g. /job-posts/{job_post_id})
+    rather than the raw path, so the number of series stays bounded.
+    """
+
+    def __init__(self, app, routes):
+        self.app = app
+        self.routes = routes
+
+    def _route_of(self, scope) -> str:
+        partial = None
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+            if match == Match.PARTIAL and partial is None:
+                partial = route.path
+        return partial or "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        route = self._route_of(scope)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc(method, route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_request_duration_seconds.observe(time.perf_counter() - started, method, route)
+            http_requests_total.inc(method, route, status_code)
+            http_requests_in_progress.dec(method, route)
+
+class CommandMetrics(monitoring.CommandListener):
+    """Records the duration of every MongoDB command per collection and command name."""
+
+    def __init__(self):
+        self._collections: Dict[Tuple, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(event):
+        return event.connection_id, event.request_id
+
+    def started(self, event):
+        # The collection is only known from the command document of the started event
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            collection = ""
+        with self._lock:
+            self._collections[self._key(event)] = collection
+
+    def _finished(self, event) -> str:
+        with self._lock:
+            return self._collections.pop(self._key(event), "")
+
+    def succeeded(self, event):
+        collection = self._finished(event)
+        mongodb_command_duration_seconds.observe(event.duration_micros / 1e6, collection, event.command_name)
+
+    def failed(self, event):
+        collection = self._finished(event)
+        mongodb_command_duration_seconds.observe(event.duration_micros / 1e6, collection, event.command_name)
+        mongodb_command_failures_total.inc(collection, event.command_name)
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Records how long operations wait to check a connection out of the pool."""
+
+    def __init__(self):
+        # A checkout starts and ends on the same driver thread
+        self._local = threading.local()
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def _waited(self):
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        return None if started is None else time.perf_counter() - started
+
+    def connection_checked_out(self, event):
+        waited = self._waited()
+        if waited is not None:
+            mongodb_pool_checkout_wait_seconds.observe(waited)
+
+    def connection_check_out_failed(self, event):
+        waited = self._waited()
+        if waited is not None:
+            mongodb_pool_checkout_wait_seconds.observe(waited)
+        mongodb_pool_checkout_failures_total.inc(event.reason)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+def _cache_metrics():
+    stats = cache_stats()
+    for key, metric_type, documentation in (
+        ("hits", "counter", "Cache lookups that found a live entry."),
+        ("misses", "counter", "Cache lookups that found nothing."),
+        ("evictions", "counter", "Entries dropped to stay within maxsize."),
+        ("size", "gauge", "Entries currently cached."),
+    ):
+        name = f"cache_{key}_total" if metric_type == "counter" else f"cache_{key}"
+        yield name, metric_type, documentation, [({"cache": cache}, values[key]) for cache, values in stats.items()]
+
+def _hash_pool_metrics():
+    stats = hash_pool_stats()
+    yield "password_hash_pending", "gauge", "bcrypt calls running or queued.", [({}, stats["pending"])]
+    yield "password_hash_capacity", "gauge", "bcrypt calls accepted before answering 503.", [
+        ({}, stats["workers"] + stats["queue_limit"])
+    ]
+
+register_collector(_cache_metrics)
+register_collector(_hash_pool_metrics)
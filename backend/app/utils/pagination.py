@@ -1,25 +1,145 @@
-from typing import TypeVar, Generic, List, Optional, Any
+from typing import TypeVar, Generic, List, Optional, Any, Tuple
+from datetime import datetime
+import base64
+import json
+import os
+from fastapi import HTTPException, status
 from pydantic import BaseModel, Field
 from pydantic.generics import GenericModel
+from pymongo import DESCENDING
+from app.utils.cache import TTLCache
 
 T = TypeVar('T')
 
+# Every list is ordered newest first; _id breaks ties between equal timestamps
+KEYSET_SORT = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+# Exact totals are cached briefly per (collection, filter) and dropped on writes
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", 10))
+count_cache = TTLCache("counts", maxsize=1024, ttl=COUNT_CACHE_TTL)
+
 class PaginatedResponse(GenericModel, Generic[T]):
     """Generic paginated response model."""
     data: List[T]
-    total: int
-    page: int
+    total: Optional[int]
+    total_is_approximate: bool = False
+    page: Optional[int]
     limit: int
-    pages: int
-    
+    pages: Optional[int]
+    next_cursor: Optional[str] = None
+
     @classmethod
-    def create(cls, items: List[T], total: int, page: int, limit: int):
-        """Create a paginated response."""
-        pages = (total + limit - 1) // limit if limit else 1
+    def create(
+        cls,
+        items: List[T],
+        total: Optional[int],
+        page: Optional[int],
+        limit: int,
+        next_cursor: Optional[str] = None,
+        total_is_approximate: bool = False
+    ):
+        """Create a paginated response; total and pages are None when not counted."""
+        if total is None:
+            pages = None
+        else:
+            pages = (total + limit - 1) // limit if limit else 1
         return cls(
             data=items,
             total=total,
+            total_is_approximate=total_is_approximate,
             page=page,
             limit=limit,
-            pages=pages
+            pages=pages,
+            next_cursor=next_cursor
+        )
+
+def encode_cursor(document: dict) -> str:
+    """Build an opaque cursor pointing just after the given document.
+
+    Documents older than the created_at field have none; they sort after all
+    dated ones and are paged by _id alone.
+    """
+    created_at = document.get("created_at")
+    raw = json.dumps([created_at.isoformat() if created_at else None, document["_id"]])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], Any]:
+    """Parse a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, last_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(created_at) if created_at is not None else None), last_id
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
         )
+
+def seek_filter(filter_query: dict, cursor: str) -> dict:
+    """Restrict a filter to the documents that sort after the cursor."""
+    created_at, last_id = decode_cursor(cursor)
+    if created_at is None:
+        # Undated documents come last in KEYSET_SORT; only they can follow one
+        after = {"created_at": None, "_id": {"$lt": last_id}}
+    else:
+        after = {"$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": last_id}},
+            {"created_at": None},
+        ]}
+    return {"$and": [filter_query, after]} if filter_query else after
+
+async def fetch_page(
+    collection,
+    filter_query: dict,
+    skip: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    projection: Optional[dict] = None
+):
+    """Fetch one page in KEYSET_SORT order, by offset or by cursor.
+
+    Returns the documents and the cursor of the next page (None on the last page).
+    With a cursor the query seeks straight to the page through the
+    (…, created_at, _id) indexes, so deep pages cost the same as the first one.
+    """
+    if projection is not None:
+        # The next cursor is built from created_at, the list ETag from updated_at as well
+        projection = {**projection, "created_at": 1, "updated_at": 1}
+    if cursor:
+        query = collection.find(seek_filter(filter_query, cursor), projection).sort(KEYSET_SORT)
+    else:
+        query = collection.find(filter_query, projection).sort(KEYSET_SORT).skip(skip)
+    # Read one extra document to learn whether another page exists
+    documents = await query.limit(limit + 1).to_list(length=limit + 1)
+    next_cursor = encode_cursor(documents[limit - 1]) if len(documents) > limit else None
+    return documents[:limit], next_cursor
+
+def page_number(skip: int, limit: int, cursor: Optional[str] = None) -> Optional[int]:
+    """Page number for offset pagination; cursor pages have none."""
+    return None if cursor else (skip // limit) + 1
+
+def _count_key(collection_name: str, filter_query: dict):
+    return collection_name, json.dumps(filter_query, sort_keys=True, default=str)
+
+async def count_total(collection, filter_query: dict, include_total: bool = True, approximate: bool = False):
+    """Total for a paginated list, returned as (total, is_approximate).
+
+    Skipped entirely when include_total is false. Unfiltered lists may use the
+    collection metadata count when approximate is set; everything else is an
+    exact count served from count_cache when possible.
+    """
+    if not include_total:
+        return None, False
+    if approximate and not filter_query:
+        return await collection.estimated_document_count(), True
+    key = _count_key(collection.name, filter_query)
+    total = count_cache.get(key)
+    if total is None:
+        total = await collection.count_documents(filter_query)
+        count_cache.set(key, total)
+    return total, False
+
+def invalidate_counts(*collection_names: str):
+    """Drop cached totals after documents were inserted, deleted or re-filed."""
+    count_cache.invalidate_where(lambda key: key[0] in collection_names)
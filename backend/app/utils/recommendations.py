@@ -0,0 +1,162 @@
+"""Precomputed job recommendations for job seekers.
+
+Each feed is one document in the recommendations collection, keyed by user
+id, so serving it is a single _id lookup. Feeds are computed by a background
+job and marked stale when the seeker's profile or applications change, when
+job posts are created or edited, or when they are older than RECOMMENDATION_TTL.
+"""
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+from pymongo.errors import DuplicateKeyError
+from app.models.recommendation import FeedStatus
+from app.utils.jobs import job_handler, enqueue_job, JobContext, JOB_LOCK_SECONDS
+from app.utils.skills import (
+    job_post_skill_index, normalize_skills, known_skills, ensure_skill_indexes, unindex_job_post
+)
+
+REFRESH_RECOMMENDATIONS_JOB = "refresh_recommendations"
+
+# Seconds before a feed is recomputed even without changes (new job posts)
+RECOMMENDATION_TTL = float(os.getenv("RECOMMENDATION_TTL", 3600))
+# Job posts kept per feed
+RECOMMENDATION_LIMIT = int(os.getenv("RECOMMENDATION_LIMIT", 50))
+# Skills only implied by experience or past applications count for this much of a profile skill
+SECONDARY_SKILL_WEIGHT = 0.5
+# Requirement terms found in more than this share of job posts ("experience", "with") are not
+# skills; they are ignored as implied skills once there are enough job posts to tell
+COMMON_TERM_SHARE = 0.5
+COMMON_TERM_MIN_JOB_POSTS = 20
+
+_JOB_POST_FIELDS = {"title": 1, "company": 1, "location": 1, "job_type": 1, "salary_min": 1, "salary_max": 1}
+
+def feed_status(feed: Optional[dict]) -> FeedStatus:
+    if not feed or feed.get("computed_at") is None:
+        return FeedStatus.PENDING
+    if feed.get("stale") or feed["computed_at"] < datetime.utcnow() - timedelta(seconds=RECOMMENDATION_TTL):
+        return FeedStatus.STALE
+    return FeedStatus.FRESH
+
+async def request_refresh(db, user_id: int, created_by: Optional[int] = None) -> Optional[dict]:
+    """Enqueue a refresh unless one is already underway; returns the new job, if any."""
+    now = datetime.utcnow()
+    try:
+        # Claim the refresh on the feed document so concurrent readers enqueue it once
+        await db.recommendations.update_one(
+            {"_id": user_id, "$or": [
+                {"refresh_requested_at": None},
+                {"refresh_requested_at": {"$lt": now - timedelta(seconds=JOB_LOCK_SECONDS)}},
+            ]},
+            {"$set": {"refresh_requested_at": now}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        return None
+    return await enqueue_job(db, REFRESH_RECOMMENDATIONS_JOB, {"user_id": user_id}, created_by=created_by)
+
+async def invalidate_recommendations(db, user_id: int):
+    """Mark a seeker's feed stale after their profile or applications changed, and refresh it."""
+    await db.recommendations.update_one(
+        {"_id": user_id},
+        {"$set": {"stale": True}, "$inc": {"version": 1}},
+        upsert=True
+    )
+    await request_refresh(db, user_id)
+
+async def drop_job_posts_from_feeds(db, job_post_ids: List[int]):
+    """Remove deleted job posts from every stored feed."""
+    await db.recommendations.update_many(
+        {"items.job_post_id": {"$in": job_post_ids}},
+        {"$pull": {"items": {"job_post_id": {"$in": job_post_ids}}}}
+    )
+
+async def invalidate_all_recommendations(db):
+    """Mark every feed stale after job posts were added or changed.
+
+    Feeds are not refreshed here; each one is recomputed the next time its
+    seeker reads it.
+    """
+    await db.recommendations.update_many({}, {"$set": {"stale": True}, "$inc": {"version": 1}})
+
+async def compute_recommendations(db, user_id: int, profile: dict) -> List[dict]:
+    """Score job posts against a seeker's skills, experience and past applications."""
+    skills = normalize_skills(profile.get("skills"))
+    applied = await db.applications.distinct("job_post_id", {"user_id": user_id})
+
+    # Weaker signals: skills named in the experience text or asked for by jobs applied to,
+    # as far as any job post asks for them
+    secondary = known_skills([profile.get("experience") or ""], job_post_skill_index)
+    async for job_post in db.job_posts.find({"_id": {"$in": applied}}, {"requirements": 1}):
+        secondary |= known_skills(job_post.get("requirements"), job_post_skill_index)
+    if len(job_post_skill_index) >= COMMON_TERM_MIN_JOB_POSTS:
+        common = job_post_skill_index.common_skills(COMMON_TERM_SHARE)
+        # Also drops phrases such as "with docker" that only wrap a skill in a common word
+        secondary = {
+            term for term in secondary
+            if term not in common and term.split()[0] not in common and term.split()[-1] not in common
+        }
+    secondary -= skills
+
+    candidates = RECOMMENDATION_LIMIT + len(applied)
+    scores = {}
+    for job_post_id, shared in job_post_skill_index.score(skills, limit=candidates):
+        scores[job_post_id] = float(shared)
+    for job_post_id, shared in job_post_skill_index.score(secondary, limit=candidates):
+        scores[job_post_id] = scores.get(job_post_id, 0.0) + SECONDARY_SKILL_WEIGHT * shared
+    for job_post_id in applied:
+        scores.pop(job_post_id, None)
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))[:RECOMMENDATION_LIMIT]
+
+    job_posts = {
+        job_post["_id"]: job_post
+        async for job_post in db.job_posts.find({"_id": {"$in": [job_post_id for job_post_id, _ in ranked]}}, _JOB_POST_FIELDS)
+    }
+    wanted = skills | secondary
+    items = []
+    for job_post_id, score in ranked:
+        job_post = job_posts.get(job_post_id)
+        if job_post is None:
+            # Deleted through another process; still indexed until the next rebuild
+            unindex_job_post(job_post_id)
+            continue
+        items.append({
+            "job_post_id": job_post_id,
+            "title": job_post["title"],
+            "company": job_post["company"],
+            "location": job_post["location"],
+            "job_type": job_post["job_type"],
+            "salary_min": job_post.get("salary_min"),
+            "salary_max": job_post.get("salary_max"),
+            "score": round(score, 4),
+            "matched_skills": sorted(wanted & job_post_skill_index.skills_of(job_post_id)),
+        })
+    return items
+
+@job_handler(REFRESH_RECOMMENDATIONS_JOB)
+async def refresh_recommendations(ctx: JobContext):
+    """Recompute and store the feed of one job seeker."""
+    db = ctx.db
+    user_id = ctx.params["user_id"]
+    await ensure_skill_indexes(db)
+
+    feed = await db.recommendations.find_one({"_id": user_id}, {"version": 1})
+    version = feed.get("version") if feed else None
+    profile = await db.profiles.find_one({"user_id": user_id}, {"skills": 1, "experience": 1})
+    if not profile:
+        await db.recommendations.delete_one({"_id": user_id})
+        return
+
+    items = await compute_recommendations(db, user_id, profile)
+    stored = {"items": items, "computed_at": datetime.utcnow()}
+    # Only clear the stale flag if nothing was invalidated while computing
+    result = await db.recommendations.update_one(
+        {"_id": user_id, "version": version},
+        {"$set": {**stored, "stale": False}, "$unset": {"refresh_requested_at": ""}}
+    )
+    if not result.matched_count:
+        await db.recommendations.update_one(
+            {"_id": user_id},
+            {"$set": stored, "$unset": {"refresh_requested_at": ""}},
+            upsert=True
+        )
+    await ctx.report(recommendations=len(items))
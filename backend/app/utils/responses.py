@@ -0,0 +1,60 @@
+import os
+from typing import List, Optional, Type
+from dotenv import load_dotenv
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Load environment variables
+load_dotenv()
+
+# Endpoints that opt in use the fast path only when orjson is installed and it
+# has not been switched off
+FAST_JSON_RESPONSES = orjson is not None and os.getenv("FAST_JSON_RESPONSES", "1").lower() in ("1", "true", "yes")
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (datetimes and enums handled natively)."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+def trusted_dict(model: Type[BaseModel], document: dict) -> dict:
+    """Shape a document read from Mongo like `model.dict(by_alias=True)`, without validation.
+
+    Only for data this API wrote itself: fields are picked by alias and filled
+    with their defaults when missing, but values are not checked or coerced.
+    Fields not declared on the model (e.g. hashed_password) are dropped.
+    """
+    return {
+        field.alias: document[field.alias] if field.alias in document else field.get_default()
+        for field in model.__fields__.values()
+    }
+
+def fast_page(
+    model: Type[BaseModel],
+    documents: List[dict],
+    total: Optional[int],
+    page: Optional[int],
+    limit: int,
+    next_cursor: Optional[str] = None,
+    total_is_approximate: bool = False,
+    headers: Optional[dict] = None
+) -> FastJSONResponse:
+    """Render a PaginatedResponse body directly, skipping response_model validation."""
+    pages = None if total is None else ((total + limit - 1) // limit if limit else 1)
+    return FastJSONResponse(
+        {
+            "data": [trusted_dict(model, document) for document in documents],
+            "total": total,
+            "total_is_approximate": total_is_approximate,
+            "page": page,
+            "limit": limit,
+            "pages": pages,
+            "next_cursor": next_cursor,
+        },
+        headers=headers,
+    )
@@ -1,8 +1,25 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
 
 # Password context for hashing and verifying
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Hashing pool configuration: "thread" or "process" executor, number of
+# concurrent bcrypt workers and how many extra calls may wait in the queue
+HASH_EXECUTOR = os.getenv("HASH_EXECUTOR", "thread")
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", min(4, os.cpu_count() or 1)))
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", 32))
+
+_executor = None
+_pending = 0
+
 def verify_password(plain_password, hashed_password):
     """Verify a password against a hash."""
     return pwd_context.verify(plain_password, hashed_password)
@@ -10,3 +27,52 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     """Generate a hash from a password."""
     return pwd_context.hash(password)
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        if HASH_EXECUTOR == "process":
+            _executor = ProcessPoolExecutor(max_workers=HASH_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+    return _executor
+
+def hash_pool_stats():
+    """Current load of the hashing pool."""
+    return {
+        "executor": HASH_EXECUTOR,
+        "workers": HASH_WORKERS,
+        "queue_limit": HASH_QUEUE_LIMIT,
+        "pending": _pending,
+    }
+
+async def _run_in_pool(func, *args):
+    """Run a bcrypt call in the worker pool, rejecting it when the queue is full."""
+    global _pending
+    if _pending >= HASH_WORKERS + HASH_QUEUE_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please try again",
+            headers={"Retry-After": "1"},
+        )
+    _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), func, *args)
+    finally:
+        _pending -= 1
+
+async def verify_password_async(plain_password, hashed_password):
+    """Verify a password against a hash without blocking the event loop."""
+    return await _run_in_pool(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    """Generate a hash from a password without blocking the event loop."""
+    return await _run_in_pool(get_password_hash, password)
+
+def shutdown_hash_pool():
+    """Release the hashing workers."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
@@ -1,21 +1,57 @@
+import asyncio
+import os
+from typing import Dict
+from pymongo import ReturnDocument
+from dotenv import load_dotenv
 from database import db
 
-async def get_next_sequence_value(sequence_name: str) -> int:
-    """Get the next sequence value for auto-incrementing IDs."""
+# Load environment variables
+load_dotenv()
+
+# How many IDs a process reserves from the counter document at a time
+SEQUENCE_BLOCK_SIZE = int(os.getenv("SEQUENCE_BLOCK_SIZE", 1000))
+
+class SequenceBlock:
+    """Range of IDs reserved by this process: next_value .. high inclusive."""
+
+    def __init__(self):
+        self.next_value = 1
+        self.high = 0
+        self.lock = asyncio.Lock()
+
+_blocks: Dict[str, SequenceBlock] = {}
+
+async def reserve_sequence_block(sequence_name: str, size: int) -> int:
+    """Atomically reserve `size` IDs and return the highest one.
+
+    The counter stores the highest ID ever handed out, so every reservation,
+    from any process or after any restart, lies above all previous ones.
+    """
     result = await db.counters.find_one_and_update(
         {"_id": sequence_name},
-        {"$inc": {"sequence_value": 1}},
+        {"$inc": {"sequence_value": size}},
         upsert=True,
-        return_document=True
+        return_document=ReturnDocument.AFTER
     )
-    
-    if result:
-        return result["sequence_value"]
-    else:
-        # Initialize counter if not exists
-        await db.counters.insert_one({"_id": sequence_name, "sequence_value": 1})
-        return 1
+    return result["sequence_value"]
+
+async def get_next_sequence_value(sequence_name: str) -> int:
+    """Get the next sequence value for auto-incrementing IDs.
+
+    IDs come from a block reserved with a single $inc, so the counter document
+    is only touched once per SEQUENCE_BLOCK_SIZE inserts. IDs increase within a
+    process; unused IDs of a block are skipped when the process exits.
+    """
+    block = _blocks.setdefault(sequence_name, SequenceBlock())
+    async with block.lock:
+        if block.next_value > block.high:
+            block.high = await reserve_sequence_block(sequence_name, SEQUENCE_BLOCK_SIZE)
+            block.next_value = block.high - SEQUENCE_BLOCK_SIZE + 1
+        value = block.next_value
+        block.next_value += 1
+        return value
 
 async def reset_sequence(sequence_name: str):
     """Reset sequence counter to 0."""
     await db.counters.delete_one({"_id": sequence_name})
+    _blocks.pop(sequence_name, None)
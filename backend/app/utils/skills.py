@@ -0,0 +1,290 @@
+import asyncio
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Spellings that refer to the same skill, mapped to one canonical name
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ts": "typescript",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "golang": "go",
+    "postgres": "postgresql",
+    "mongo": "mongodb",
+    "k8s": "kubernetes",
+    "ms excel": "excel",
+    "microsoft excel": "excel",
+    "c sharp": "c#",
+    "cpp": "c++",
+    "py": "python",
+}
+
+# The indexes live in each process's memory. Every process re-reads the profiles
+# and job posts written since its last sync (by any process) at most this often...
+SKILL_INDEX_SYNC_INTERVAL = float(os.getenv("SKILL_INDEX_SYNC_INTERVAL", 5))
+# ...and rebuilds from scratch at this interval, which also drops deletions made elsewhere
+SKILL_INDEX_REBUILD_INTERVAL = float(os.getenv("SKILL_INDEX_REBUILD_INTERVAL", 600))
+# Timestamps come from the writing process's clock; re-read this far back to cover skew and in-flight writes
+SKILL_INDEX_SYNC_OVERLAP = timedelta(seconds=30)
+
+# A term is at most this many words, e.g. "machine learning" or "microsoft excel"
+MAX_SKILL_WORDS = 3
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+def _tokens(text: str) -> List[str]:
+    return [token.rstrip(".") for token in _TOKEN.findall(text.lower())]
+
+def normalize_skill(skill: str) -> str:
+    """Canonical form of a skill: lower case, single spaces, aliases resolved."""
+    normalized = " ".join(_tokens(skill))
+    return SKILL_ALIASES.get(normalized, normalized)
+
+def normalize_skills(skills: Iterable[str]) -> Set[str]:
+    """Canonical skills of a profile; empty entries are dropped."""
+    return {skill for skill in (normalize_skill(s) for s in skills or []) if skill}
+
+def extract_terms(texts: Iterable[str]) -> Set[str]:
+    """Every skill a free-text requirement may name: the whole phrase and each 1-3 word sequence.
+
+    "3+ years of Node.js or Python" yields "node.js" and "python" among
+    others; terms that are nobody's skill simply never match.
+    """
+    terms = set()
+    for text in texts or []:
+        tokens = _tokens(text)
+        whole = " ".join(tokens)
+        if whole:
+            terms.add(SKILL_ALIASES.get(whole, whole))
+        for size in range(1, MAX_SKILL_WORDS + 1):
+            for start in range(len(tokens) - size + 1):
+                term = " ".join(tokens[start:start + size])
+                terms.add(SKILL_ALIASES.get(term, term))
+    return terms
+
+class SkillIndex:
+    """Inverted index from skills to entities, scored with NumPy.
+
+    Postings are kept as two parallel arrays (row, skill). Scoring a query is
+    one vectorized membership test plus a bincount over the rows, so it costs
+    the same regardless of how many skills the query shares with each entity.
+    Updates append a new row and retire the old one; retired rows are dropped
+    by compacting once they make up a quarter of the index.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.vocabulary: Dict[str, int] = {}
+        self._row_of: Dict[Hashable, int] = {}
+        self._entity_of: List[Optional[Hashable]] = []  # row -> entity, None when retired
+        self._skills_of: Dict[Hashable, Set[str]] = {}
+        self._entry_rows = np.empty(0, dtype=np.int32)
+        self._entry_skills = np.empty(0, dtype=np.int32)
+        self._pending_rows: List[int] = []
+        self._pending_skills: List[int] = []
+        self._retired: Set[int] = set()
+        self._common: Optional[Tuple[float, Set[str]]] = None  # (share, skills) of the last common_skills call
+
+    def __len__(self):
+        return len(self._row_of)
+
+    def __contains__(self, entity_id: Hashable):
+        return entity_id in self._row_of
+
+    def skills_of(self, entity_id: Hashable) -> Set[str]:
+        return self._skills_of.get(entity_id, set())
+
+    def set(self, entity_id: Hashable, skills: Set[str]):
+        """Index (or re-index) an entity under already normalized skills."""
+        self.remove(entity_id)
+        self._common = None
+        if not skills:
+            return
+        row = len(self._entity_of)
+        self._entity_of.append(entity_id)
+        self._row_of[entity_id] = row
+        self._skills_of[entity_id] = set(skills)
+        for skill in skills:
+            self._pending_rows.append(row)
+            self._pending_skills.append(self.vocabulary.setdefault(skill, len(self.vocabulary)))
+
+    def remove(self, entity_id: Hashable):
+        row = self._row_of.pop(entity_id, None)
+        if row is None:
+            return
+        self._skills_of.pop(entity_id, None)
+        self._entity_of[row] = None
+        self._common = None
+        self._retired.add(row)
+        if len(self._retired) * 4 > len(self._entity_of):
+            self._compact()
+
+    def clear(self):
+        self.__init__(self.name)
+
+    def replace_with(self, other: "SkillIndex"):
+        """Take over the contents of a freshly built index, keeping this object's identity."""
+        self.__dict__.update(other.__dict__)
+
+    def _flush(self):
+        if self._pending_rows:
+            self._entry_rows = np.concatenate([self._entry_rows, np.asarray(self._pending_rows, dtype=np.int32)])
+            self._entry_skills = np.concatenate([self._entry_skills, np.asarray(self._pending_skills, dtype=np.int32)])
+            self._pending_rows = []
+            self._pending_skills = []
+
+    def _compact(self):
+        """Renumber the live rows and drop the postings of retired ones."""
+        self._flush()
+        mapping = np.full(len(self._entity_of), -1, dtype=np.int32)
+        entities = [entity for entity in self._entity_of if entity is not None]
+        live_rows = [row for row, entity in enumerate(self._entity_of) if entity is not None]
+        mapping[live_rows] = np.arange(len(live_rows), dtype=np.int32)
+        keep = mapping[self._entry_rows] >= 0
+        self._entry_rows = mapping[self._entry_rows[keep]]
+        self._entry_skills = self._entry_skills[keep]
+        self._entity_of = entities
+        self._row_of = {entity: row for row, entity in enumerate(entities)}
+        self._retired = set()
+
+    def common_skills(self, share: float) -> Set[str]:
+        """Skills indexed for more than `share` of the entities, e.g. "with" in job requirements."""
+        if self._common is None or self._common[0] != share:
+            self._flush()
+            live = np.ones(len(self._entity_of), dtype=bool)
+            live[list(self._retired)] = False
+            counts = np.bincount(self._entry_skills[live[self._entry_rows]], minlength=len(self.vocabulary))
+            names = list(self.vocabulary)  # ids were assigned in insertion order
+            self._common = (share, {names[i] for i in np.flatnonzero(counts > share * len(self))})
+        return self._common[1]
+
+    def score(
+        self,
+        skills: Set[str],
+        candidates: Optional[Iterable[Hashable]] = None,
+        limit: int = 20
+    ) -> List[Tuple[Hashable, int]]:
+        """Entities sharing the most skills with the query, as (entity, shared count).
+
+        Only entities in `candidates` are ranked when it is given. Ties are
+        broken by the order in which entities were indexed.
+        """
+        query = [self.vocabulary[skill] for skill in skills if skill in self.vocabulary]
+        if not query or not self._row_of:
+            return []
+        self._flush()
+        hits = np.isin(self._entry_skills, np.asarray(query, dtype=np.int32))
+        counts = np.bincount(self._entry_rows[hits], minlength=len(self._entity_of))
+        if self._retired:
+            counts[list(self._retired)] = 0
+        if candidates is not None:
+            rows = np.asarray([self._row_of[c] for c in candidates if c in self._row_of], dtype=np.int64)
+        else:
+            rows = np.flatnonzero(counts)
+        rows = rows[counts[rows] > 0]
+        if len(rows) > limit:
+            # Partial selection of the best rows, then a stable sort of those only
+            rows = rows[np.argpartition(-counts[rows], limit - 1)[:limit]]
+        rows = rows[np.lexsort((rows, -counts[rows]))]
+        return [(self._entity_of[row], int(counts[row])) for row in rows]
+
+# Job seekers by user id, under their profile skills
+profile_skill_index = SkillIndex("profiles")
+# Job posts by id, under the terms of their requirements
+job_post_skill_index = SkillIndex("job_posts")
+
+def index_profile(profile: dict):
+    profile_skill_index.set(profile["user_id"], normalize_skills(profile.get("skills")))
+
+def unindex_profile(user_id: int):
+    profile_skill_index.remove(user_id)
+
+def index_job_post(job_post: dict):
+    job_post_skill_index.set(job_post["_id"], extract_terms(job_post.get("requirements")))
+
+def unindex_job_post(job_post_id: int):
+    job_post_skill_index.remove(job_post_id)
+
+def known_skills(texts: Iterable[str], index: SkillIndex = profile_skill_index) -> Set[str]:
+    """Skills named in free text (requirements, experience), limited to the vocabulary of `index`.
+
+    Pass the index the terms will be scored against: profile skills when
+    ranking candidates for a job, job post requirements when ranking jobs.
+    """
+    return {term for term in extract_terms(texts) if term in index.vocabulary}
+
+_PROFILE_FIELDS = {"user_id": 1, "skills": 1}
+_JOB_POST_FIELDS = {"requirements": 1}
+
+_build_task: Optional[asyncio.Task] = None
+_rebuild_task: Optional[asyncio.Task] = None
+_sync_task: Optional[asyncio.Task] = None
+_built_at = 0.0  # time.monotonic() of the last full build
+_synced_at = 0.0  # time.monotonic() of the last catch-up read
+_synced_until: Optional[datetime] = None  # writes up to this (UTC) time are indexed
+
+async def build_skill_indexes(db):
+    """Load every profile and job post into fresh indexes, then swap them in."""
+    global _built_at, _synced_at, _synced_until
+    started = datetime.utcnow()
+    profiles, job_posts = SkillIndex("profiles"), SkillIndex("job_posts")
+    async for profile in db.profiles.find({}, _PROFILE_FIELDS):
+        profiles.set(profile["user_id"], normalize_skills(profile.get("skills")))
+    async for job_post in db.job_posts.find({}, _JOB_POST_FIELDS):
+        job_posts.set(job_post["_id"], extract_terms(job_post.get("requirements")))
+    profile_skill_index.replace_with(profiles)
+    job_post_skill_index.replace_with(job_posts)
+    # Writes made while scanning (here or elsewhere) are picked up by the next sync
+    _built_at = time.monotonic()
+    _synced_at = 0.0
+    _synced_until = started
+    print(f"Skill indexes built: {len(profile_skill_index)} profiles, {len(job_post_skill_index)} job posts")
+
+async def sync_skill_indexes(db):
+    """Re-index the profiles and job posts created or updated since the last sync."""
+    global _synced_at, _synced_until
+    started = datetime.utcnow()
+    since = _synced_until - SKILL_INDEX_SYNC_OVERLAP
+    changed = {"$or": [{"created_at": {"$gt": since}}, {"updated_at": {"$gt": since}}]}
+    async for profile in db.profiles.find(changed, _PROFILE_FIELDS):
+        index_profile(profile)
+    async for job_post in db.job_posts.find(changed, _JOB_POST_FIELDS):
+        index_job_post(job_post)
+    _synced_at = time.monotonic()
+    _synced_until = started
+
+def _failed(task: Optional[asyncio.Task]) -> bool:
+    return task is not None and task.done() and (task.cancelled() or task.exception() is not None)
+
+def start_skill_index_build(db):
+    """Build the indexes in the background, e.g. at startup."""
+    global _build_task
+    # Retry when a previous build failed or was cancelled
+    if _build_task is None or _failed(_build_task):
+        _build_task = asyncio.create_task(build_skill_indexes(db))
+
+async def ensure_skill_indexes(db):
+    """Wait until the indexes are built and caught up with recent writes from every process.
+
+    A full rebuild is started in the background once SKILL_INDEX_REBUILD_INTERVAL
+    has passed; until it finishes, the current indexes keep being served.
+    """
+    global _rebuild_task, _sync_task
+    start_skill_index_build(db)
+    await asyncio.shield(_build_task)
+    now = time.monotonic()
+    if now - _built_at > SKILL_INDEX_REBUILD_INTERVAL and (_rebuild_task is None or _rebuild_task.done()):
+        _rebuild_task = asyncio.create_task(build_skill_indexes(db))
+    if now - _synced_at > SKILL_INDEX_SYNC_INTERVAL:
+        if _sync_task is None or _sync_task.done():
+            _sync_task = asyncio.create_task(sync_skill_indexes(db))
+        await asyncio.shield(_sync_task)
@@ -0,0 +1,100 @@
+"""Time and allocations of convert_object_id per simulated list request.
+
+Two document shapes are measured, as stored: profile-like documents (integer
+ids, long string lists) and application-like documents (flat, with the GridFS
+``cv_file_id`` kept as a string). Neither holds an ObjectId, so every route now
+skips the call; each shape compares the previous copying implementation, the
+single-pass one and no call at all.
+
+Usage (from the backend directory):
+    python -m benchmarks.convert_object_id --documents 100 --repeat 50
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+
+from bson import ObjectId
+
+from app.models.base import convert_object_id
+
+
+def copying_convert(obj):
+    """The previous implementation (it never converted ObjectIds), kept for comparison."""
+    if isinstance(obj, dict):
+        return {key: copying_convert(value) for key, value in obj.items()}
+    elif isinstance(obj, list):
+        return [copying_convert(item) for item in obj]
+    return obj
+
+
+def skip(obj):
+    return obj
+
+
+def make_profiles(count):
+    return [
+        {
+            "_id": i,
+            "user_id": i,
+            "full_name": "John Doe",
+            "skills": [f"skill-{n}" for n in range(50)],
+            "requirements": [f"requirement {n}" for n in range(50)],
+            "history": [{"status": "Pending", "at": datetime.utcnow()} for _ in range(20)],
+            "cv_filename": "cv.pdf",
+            "created_at": datetime.utcnow(),
+        }
+        for i in range(count)
+    ]
+
+
+def make_applications(count):
+    return [
+        {
+            "_id": i,
+            "user_id": i,
+            "job_post_id": i,
+            "status": "Pending",
+            "cv_filename": "cv.pdf",
+            "cv_content_type": "application/pdf",
+            "cv_size": 120_000,
+            "cv_file_id": str(ObjectId()),  # as written by store_cv / store_cv_upload
+            "created_at": datetime.utcnow(),
+        }
+        for i in range(count)
+    ]
+
+
+def measure(label, func, documents, repeat):
+    tracemalloc.start()
+    for document in documents:
+        func(document)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for document in documents:
+            func(document)
+    per_request_ms = (time.perf_counter() - started) * 1000 / repeat
+    return {
+        "implementation": label,
+        "documents": len(documents),
+        "peak_alloc_bytes_per_request": peak,
+        "ms_per_request": round(per_request_ms, 3),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=100, help="documents per simulated request")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    profiles = make_profiles(args.documents)
+    print(measure("profiles: copying", copying_convert, profiles, args.repeat))
+    print(measure("profiles: single-pass", convert_object_id, profiles, args.repeat))
+    print(measure("profiles: no call", skip, profiles, args.repeat))
+    applications = make_applications(args.documents)
+    print(measure("applications: copying", copying_convert, applications, args.repeat))
+    print(measure("applications: single-pass", convert_object_id, applications, args.repeat))
+    print(measure("applications: no call", skip, applications, args.repeat))
@@ -0,0 +1,94 @@
+"""Serialize a 100-row GET /job-posts/ page through the standard and fast paths.
+
+The standard path is what the route did before: build JobPost models, let
+FastAPI validate them again through response_model, run jsonable_encoder and
+render with the stdlib json module. The fast path shapes the Mongo documents
+with trusted_dict() and renders them with orjson.
+
+Usage (from the backend directory):
+    python -m benchmarks.json_responses --rows 100 --repeat 200
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.models.base import convert_object_id
+from app.models.job_post import JobPost
+from app.utils.pagination import PaginatedResponse
+from app.utils.responses import fast_page
+
+
+def make_documents(rows):
+    now = datetime.utcnow().replace(microsecond=0)
+    return [
+        {
+            "_id": i,
+            "user_id": i % 7 + 1,
+            "title": f"Senior Python Developer {i}",
+            "company": "Tech Solutions Inc",
+            "location": "Jakarta, Indonesia",
+            "job_type": "Full-time",
+            "description": "We are looking for an experienced Python developer to join our team. " * 5,
+            "requirements": ["3+ years Python experience", "Knowledge of Django/FastAPI", "Database experience"],
+            "salary_min": 8000000,
+            "salary_max": 12000000,
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": None,
+            "user_name": "Tech Solutions HR",
+            "user_email": "hr@techsolutions.com",
+        }
+        for i in range(rows)
+    ]
+
+
+async def standard_path(field, documents):
+    page = PaginatedResponse[JobPost].create(
+        items=[JobPost(**convert_object_id(document)) for document in documents],
+        total=len(documents),
+        page=1,
+        limit=len(documents),
+    )
+    content = await serialize_response(field=field, response_content=page)
+    return JSONResponse(content).body
+
+
+async def fast_path(field, documents):
+    return fast_page(JobPost, documents, len(documents), 1, len(documents)).body
+
+
+async def measure(label, func, field, rows, repeat):
+    timings = []
+    for _ in range(repeat):
+        documents = make_documents(rows)
+        started = time.perf_counter()
+        body = await func(field, documents)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "path": label,
+        "rows": rows,
+        "bytes": len(body),
+        "p50_ms": round(timings[len(timings) // 2], 3),
+        "p99_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.99))], 3),
+    }
+
+
+async def main(args):
+    field = create_response_field(name="response", type_=PaginatedResponse[JobPost])
+    standard = await measure("standard", standard_path, field, args.rows, args.repeat)
+    fast = await measure("fast", fast_path, field, args.rows, args.repeat)
+    print(standard)
+    print(fast)
+    print({"speedup_p50": round(standard["p50_ms"] / fast["p50_ms"], 2)})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1 @@
+"""End-to-end load test of the API; run with ``python -m benchmarks.load``."""
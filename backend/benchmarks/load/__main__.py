@@ -0,0 +1,165 @@
+"""Seed a scratch database, drive the real app through scripted scenarios and report latencies.
+
+Requests go through httpx's ASGI transport straight into ``main.app``, so the
+numbers cover routing, validation, the database and serialization, but not
+the network or uvicorn. Install the extra dependencies first:
+
+    pip install -r benchmarks/requirements.txt
+
+Usage (from the backend directory):
+    MONGO_URI=mongodb://localhost:27017 python -m benchmarks.load run --output before.json
+    python -m benchmarks.load run --in-memory --scenarios browse,employer_review
+    python -m benchmarks.load compare before.json after.json --threshold 10
+
+The database named by MONGO_DB_NAME (default ``jobseeker_bench``) is wiped
+and reseeded on every run. ``--in-memory`` uses mongomock-motor instead of a
+server; GridFS, text search and $facet are unavailable there, so the apply
+scenario and the steps using them are skipped.
+"""
+import argparse
+import asyncio
+import os
+import platform
+import random
+import subprocess
+import sys
+from datetime import datetime
+
+os.environ.setdefault("MONGO_DB_NAME", "jobseeker_bench")
+
+from benchmarks.load.report import compare_reports, load_report, write_report  # noqa: E402
+
+
+def use_in_memory_database():
+    """Point the database module at mongomock-motor before the app is imported."""
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit("--in-memory needs mongomock-motor: pip install -r benchmarks/requirements.txt")
+    # Keep the real client (created on import, never used) from resolving a remote URI from .env
+    os.environ["MONGO_URI"] = "mongodb://localhost:27017"
+    import database
+    database.client = AsyncMongoMockClient()
+    database.db = database.client[database.MONGO_DB_NAME]
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def start_app(app, in_memory):
+    import database
+    from app.utils.jobs import start_job_workers
+    from app.utils.skills import start_skill_index_build
+
+    if not in_memory:
+        await app.router.startup()
+        return
+    # The health monitor cannot ping the stand-in; serve requests regardless
+    app.dependency_overrides[database.get_db] = lambda: database.db
+    start_job_workers(database.db)
+    start_skill_index_build(database.db)
+
+
+async def stop_app(app, in_memory):
+    from app.utils.jobs import stop_job_workers
+
+    if in_memory:
+        await stop_job_workers()
+    else:
+        await app.router.shutdown()
+
+
+async def run(args):
+    try:
+        import httpx
+    except ImportError:
+        raise SystemExit("The load benchmark needs httpx: pip install -r benchmarks/requirements.txt")
+    if args.in_memory:
+        use_in_memory_database()
+
+    import database
+    from main import app
+    from benchmarks.load.scenarios import Context, DEFAULT_ITERATIONS, SCENARIOS, run_scenario
+    from benchmarks.load.seed import SeedConfig, seed_database
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+    if args.in_memory and "apply" in scenarios:
+        print("Skipping the apply scenario: GridFS is not available in memory")
+        scenarios.remove("apply")
+
+    config = SeedConfig(
+        employers=args.employers, seekers=args.seekers, job_posts=args.job_posts,
+        applications=args.applications, seed=args.seed
+    )
+    seed = await seed_database(database.db, config, gridfs=not args.in_memory)
+    await start_app(app, args.in_memory)
+    results = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60) as client:
+            ctx = Context(client, seed, random.Random(args.seed), args.in_memory)
+            for name in scenarios:
+                iterations = args.iterations or DEFAULT_ITERATIONS[name]
+                results[name] = await run_scenario(name, ctx, iterations, args.concurrency)
+                print(f"{name}: {results[name]['requests']} requests, {results[name]['throughput_rps']} req/s")
+    finally:
+        await stop_app(app, args.in_memory)
+
+    report = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "git_revision": git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "database": "in-memory" if args.in_memory else database.db.name,
+            "seed": vars(config),
+            "concurrency": args.concurrency,
+        },
+        "scenarios": results,
+    }
+    write_report(report, args.output)
+    print(f"Report written to {args.output}")
+
+
+def compare(args):
+    lines, regressions = compare_reports(load_report(args.base), load_report(args.new), args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold}%:")
+        print("\n".join(f"  {line}" for line in regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="seed the database and run the scenarios")
+    run_parser.add_argument("--scenarios", default="browse,login_storm,apply,employer_review")
+    run_parser.add_argument("--iterations", type=int, default=None, help="journeys per scenario (default per scenario)")
+    run_parser.add_argument("--concurrency", type=int, default=20)
+    run_parser.add_argument("--employers", type=int, default=20)
+    run_parser.add_argument("--seekers", type=int, default=500)
+    run_parser.add_argument("--job-posts", type=int, default=200)
+    run_parser.add_argument("--applications", type=int, default=2000)
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--in-memory", action="store_true", help="use mongomock-motor instead of MONGO_URI")
+    run_parser.add_argument("--output", default="benchmark-report.json")
+
+    compare_parser = commands.add_parser("compare", help="compare two reports")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="allowed slowdown in percent")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        asyncio.run(run(args))
+    else:
+        compare(args)
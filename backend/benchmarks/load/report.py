@@ -0,0 +1,91 @@
+"""Latency recording, JSON reports and run-to-run comparison."""
+import json
+import statistics
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Recorder:
+    """Latencies and status codes per endpoint label, e.g. "GET /job-posts/{job_post_id}"."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, label: str, seconds: float, status: int):
+        self.latencies[label].append(seconds * 1000)
+        self.statuses[label][status] += 1
+
+    def summary(self, elapsed: float) -> dict:
+        endpoints = {}
+        for label, values in sorted(self.latencies.items()):
+            statuses = self.statuses[label]
+            endpoints[label] = {
+                "requests": len(values),
+                "errors": sum(count for status, count in statuses.items() if status >= 500),
+                "statuses": {str(status): count for status, count in sorted(statuses.items())},
+                "throughput_rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+                "mean_ms": round(statistics.fmean(values), 3),
+                "p50_ms": round(percentile(values, 50), 3),
+                "p95_ms": round(percentile(values, 95), 3),
+                "p99_ms": round(percentile(values, 99), 3),
+                "max_ms": round(max(values), 3),
+            }
+        requests = sum(len(values) for values in self.latencies.values())
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "requests": requests,
+            "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+def write_report(report: dict, path: str):
+    with open(path, "w") as handle:
+        json.dump(report, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def load_report(path: str) -> dict:
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def _change(before: float, after: float) -> float:
+    return (after - before) / before * 100 if before else 0.0
+
+
+def compare_reports(base: dict, new: dict, threshold: float) -> Tuple[List[str], List[str]]:
+    """Side-by-side lines for every endpoint of both runs, and the regressions among them.
+
+    An endpoint regresses when its p95 grows, or its throughput drops, by more
+    than `threshold` percent.
+    """
+    lines = [f"{'scenario / endpoint':<58} {'p50 ms':>17} {'p95 ms':>17} {'p99 ms':>17} {'req/s':>17}"]
+    regressions = []
+    for scenario in sorted(set(base["scenarios"]) | set(new["scenarios"])):
+        before = base["scenarios"].get(scenario, {}).get("endpoints", {})
+        after = new["scenarios"].get(scenario, {}).get("endpoints", {})
+        for label in sorted(set(before) | set(after)):
+            name = f"{scenario} / {label}"
+            if label not in before or label not in after:
+                lines.append(f"{name:<58} only in {'new' if label in after else 'base'} run")
+                continue
+            old, cur = before[label], after[label]
+            cells = []
+            for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+                cells.append(f"{old[key]:>7.1f}>{cur[key]:<7.1f}{_change(old[key], cur[key]):+.0f}%")
+            lines.append(f"{name:<58} " + " ".join(f"{cell:>17}" for cell in cells))
+            if _change(old["p95_ms"], cur["p95_ms"]) > threshold:
+                regressions.append(f"{name}: p95 {old['p95_ms']} ms -> {cur['p95_ms']} ms")
+            if -_change(old["throughput_rps"], cur["throughput_rps"]) > threshold:
+                regressions.append(f"{name}: throughput {old['throughput_rps']} -> {cur['throughput_rps']} req/s")
+    return lines, regressions
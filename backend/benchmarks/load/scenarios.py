@@ -0,0 +1,146 @@
+"""Scripted user journeys run against the app through httpx.
+
+Each scenario is one iteration of a journey; the runner repeats it with a
+fixed number of concurrent workers. Requests are recorded per route
+template so runs with different seeds remain comparable.
+"""
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from benchmarks.load.report import Recorder
+from benchmarks.load.seed import SAMPLE_CV, SEED_PASSWORD, SeedData
+
+
+class Context:
+    def __init__(self, client, seed: SeedData, rng: random.Random, in_memory: bool):
+        self.client = client
+        self.seed = seed
+        self.rng = rng
+        self.in_memory = in_memory
+        self.recorder = Recorder()
+        self.tokens: Dict[int, str] = {}
+
+    async def request(self, label: str, method: str, url: str, token: Optional[str] = None, record: bool = True, **kwargs):
+        if token:
+            kwargs["headers"] = {"Authorization": f"Bearer {token}", **kwargs.get("headers", {})}
+        started = time.perf_counter()
+        response = await self.client.request(method, url, **kwargs)
+        if record:
+            self.recorder.record(label, time.perf_counter() - started, response.status_code)
+        return response
+
+    async def login(self, user_id: int, record: bool = True) -> Optional[str]:
+        response = await self.request(
+            "POST /auth/token", "POST", "/auth/token", record=record,
+            data={"username": self.seed.emails[user_id], "password": SEED_PASSWORD}
+        )
+        return response.json()["access_token"] if response.status_code == 200 else None
+
+    async def token_for(self, user_id: int) -> Optional[str]:
+        """Cached login, so journeys other than the login storm measure only their own requests."""
+        if user_id not in self.tokens:
+            token = await self.login(user_id, record=False)
+            if token:
+                self.tokens[user_id] = token
+        return self.tokens.get(user_id)
+
+
+async def browse(ctx: Context):
+    """Anonymous visitor: two listing pages, a job post, facets and a search."""
+    response = await ctx.request("GET /job-posts/", "GET", "/job-posts/", params={"limit": 20})
+    next_cursor = response.json().get("next_cursor") if response.status_code == 200 else None
+    if next_cursor:
+        await ctx.request("GET /job-posts/ (cursor)", "GET", "/job-posts/", params={"limit": 20, "cursor": next_cursor})
+    job_post_id = ctx.rng.choice(ctx.seed.job_post_ids)
+    await ctx.request("GET /job-posts/{job_post_id}", "GET", f"/job-posts/{job_post_id}")
+    if not ctx.in_memory:
+        # $facet and text indexes are not available in the in-memory stand-in
+        await ctx.request("GET /job-posts/facets", "GET", "/job-posts/facets")
+        await ctx.request("GET /job-posts/search", "GET", "/job-posts/search", params={"q": ctx.rng.choice(["python", "designer", "sales"])})
+
+
+async def login_storm(ctx: Context):
+    """Many users logging in at once; every login runs bcrypt."""
+    await ctx.login(ctx.rng.choice(ctx.seed.employer_ids + ctx.seed.seeker_ids))
+
+
+async def apply_with_cv(ctx: Context):
+    """Job seeker uploads a CV to a job post they have not applied to yet."""
+    seeker_id = ctx.rng.choice(ctx.seed.seeker_ids)
+    for _ in range(20):
+        job_post_id = ctx.rng.choice(ctx.seed.job_post_ids)
+        if (seeker_id, job_post_id) not in ctx.seed.applied:
+            break
+    else:
+        return
+    ctx.seed.applied.add((seeker_id, job_post_id))
+    token = await ctx.token_for(seeker_id)
+    await ctx.request(
+        "POST /applications/upload", "POST", "/applications/upload", token=token,
+        data={"job_post_id": str(job_post_id)},
+        files={"cv": ("cv.pdf", SAMPLE_CV, "application/pdf")}
+    )
+    await ctx.request("GET /profiles/user/{user_id}/recommendations", "GET", f"/profiles/user/{seeker_id}/recommendations", token=token)
+
+
+async def employer_review(ctx: Context):
+    """Employer opens one of their job posts, ranks and reviews applicants, and exports them."""
+    employer_id = ctx.rng.choice(list(ctx.seed.job_posts_by_employer))
+    token = await ctx.token_for(employer_id)
+    await ctx.request("GET /job-posts/user/{user_id}", "GET", f"/job-posts/user/{employer_id}", token=token)
+    job_post_id = ctx.rng.choice(ctx.seed.job_posts_by_employer[employer_id])
+    response = await ctx.request(
+        "GET /applications/job/{job_post_id}", "GET", f"/applications/job/{job_post_id}", token=token, params={"limit": 50}
+    )
+    applications = response.json().get("data", []) if response.status_code == 200 else []
+    await ctx.request("GET /job-posts/{job_post_id}/matches", "GET", f"/job-posts/{job_post_id}/matches", token=token)
+    if applications:
+        application_id = ctx.rng.choice(applications)["_id"]
+        await ctx.request("GET /applications/{application_id}", "GET", f"/applications/{application_id}", token=token)
+        if not ctx.in_memory:
+            await ctx.request("GET /applications/{application_id}/cv", "GET", f"/applications/{application_id}/cv", token=token)
+        await ctx.request(
+            "POST /applications/bulk-status", "POST", "/applications/bulk-status", token=token,
+            json={
+                "application_ids": [application["_id"] for application in applications[:10]],
+                "status": ctx.rng.choice(["Accepted", "Rejected"]),
+            }
+        )
+    if not ctx.in_memory:
+        # The stand-in's cursors cannot be iterated asynchronously after batch_size()
+        await ctx.request(
+            "GET /applications/job/{job_post_id}/export", "GET", f"/applications/job/{job_post_id}/export",
+            token=token, params={"format": "ndjson"}
+        )
+
+
+SCENARIOS: Dict[str, Callable[[Context], Awaitable[None]]] = {
+    "browse": browse,
+    "login_storm": login_storm,
+    "apply": apply_with_cv,
+    "employer_review": employer_review,
+}
+
+# Iterations per scenario unless overridden on the command line
+DEFAULT_ITERATIONS = {"browse": 500, "login_storm": 100, "apply": 200, "employer_review": 100}
+
+
+async def run_scenario(name: str, ctx: Context, iterations: int, concurrency: int) -> dict:
+    """Run `iterations` journeys over `concurrency` workers and summarize the recorded requests."""
+    scenario = SCENARIOS[name]
+    ctx.recorder = Recorder()
+    remaining = iterations
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await scenario(ctx)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    summary = ctx.recorder.summary(time.perf_counter() - started)
+    summary.update({"iterations": iterations, "concurrency": concurrency})
+    return summary
@@ -0,0 +1,160 @@
+"""Synthetic users, profiles, job posts and applications for load tests."""
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Set, Tuple
+
+from app.models.indexes import ensure_indexes
+from app.utils import sequences
+from app.utils.cv_storage import store_cv
+from app.utils.security import get_password_hash
+
+# Every seeded user logs in with this password
+SEED_PASSWORD = "benchmark-password"
+
+# Minimal document that passes the CV content sniffing as a PDF
+SAMPLE_CV = b"%PDF-1.4\n1 0 obj << /Type /Catalog >> endobj\ntrailer << /Root 1 0 R >>\n%%EOF\n"
+
+SKILLS = [
+    "Python", "JavaScript", "TypeScript", "React", "Vue.js", "Node.js", "Go", "Java", "Kotlin", "Swift",
+    "SQL", "PostgreSQL", "MongoDB", "Redis", "Docker", "Kubernetes", "AWS", "GCP", "Linux", "Git",
+    "Excel", "Figma", "Photoshop", "Copywriting", "SEO", "Accounting", "Customer Service", "Sales",
+    "Project Management", "Data Analysis", "Machine Learning", "English", "Public Speaking", "Negotiation",
+]
+LOCATIONS = ["Jakarta", "Bandung", "Surabaya", "Yogyakarta", "Medan", "Bali", "Remote"]
+JOB_TYPES = ["Full-time", "Part-time", "Freelance", "Other"]
+TITLES = ["Developer", "Engineer", "Designer", "Analyst", "Specialist", "Consultant", "Manager", "Staff"]
+
+
+@dataclass
+class SeedConfig:
+    employers: int = 20
+    seekers: int = 500
+    job_posts: int = 200
+    applications: int = 2000
+    seed: int = 42
+
+
+@dataclass
+class SeedData:
+    """Ids of the seeded documents, used by the scenarios to build requests."""
+    employer_ids: List[int] = field(default_factory=list)
+    seeker_ids: List[int] = field(default_factory=list)
+    job_post_ids: List[int] = field(default_factory=list)
+    job_posts_by_employer: Dict[int, List[int]] = field(default_factory=dict)
+    applied: Set[Tuple[int, int]] = field(default_factory=set)  # (seeker id, job post id)
+    emails: Dict[int, str] = field(default_factory=dict)
+
+
+async def reset_database(db):
+    """Drop every collection of the scratch database."""
+    if "bench" not in db.name:
+        raise SystemExit(f"Refusing to wipe database '{db.name}': set MONGO_DB_NAME to a name containing 'bench'")
+    for name in await db.list_collection_names():
+        await db.drop_collection(name)
+    sequences._blocks.clear()
+
+
+async def seed_database(db, config: SeedConfig, gridfs: bool = True) -> SeedData:
+    """Replace the scratch database contents with deterministic synthetic data."""
+    rng = random.Random(config.seed)
+    await reset_database(db)
+    data = SeedData()
+    now = datetime.utcnow()
+    # One bcrypt hash shared by all users keeps seeding fast
+    hashed_password = get_password_hash(SEED_PASSWORD)
+
+    users = []
+    for user_id in range(1, config.employers + config.seekers + 1):
+        employer = user_id <= config.employers
+        email = f"{'employer' if employer else 'seeker'}{user_id}@bench.example.com"
+        users.append({
+            "_id": user_id,
+            "name": f"{'Employer' if employer else 'Seeker'} {user_id}",
+            "email": email,
+            "role": "Employer" if employer else "Job Seeker",
+            "hashed_password": hashed_password,
+            "created_at": now - timedelta(minutes=user_id),
+        })
+        data.emails[user_id] = email
+        (data.employer_ids if employer else data.seeker_ids).append(user_id)
+    await db.users.insert_many(users)
+
+    profiles = [
+        {
+            "_id": index,
+            "user_id": user_id,
+            "full_name": f"Seeker {user_id}",
+            "phone": f"08{user_id:010d}",
+            "age": rng.randint(18, 55),
+            "gender": rng.choice(["Male", "Female"]),
+            "description": "Synthetic profile for load testing",
+            "skills": rng.sample(SKILLS, rng.randint(3, 10)),
+            "experience": f"{rng.randint(0, 10)} years with {rng.choice(SKILLS)} and {rng.choice(SKILLS)}",
+            "education": "Bachelor",
+            "created_at": now - timedelta(minutes=index),
+        }
+        for index, user_id in enumerate(data.seeker_ids, start=1)
+    ]
+    if profiles:
+        await db.profiles.insert_many(profiles)
+
+    job_posts = []
+    for job_post_id in range(1, config.job_posts + 1):
+        employer_id = rng.choice(data.employer_ids)
+        skills = rng.sample(SKILLS, rng.randint(2, 6))
+        salary_min = rng.randrange(3_000_000, 20_000_000, 500_000)
+        job_posts.append({
+            "_id": job_post_id,
+            "user_id": employer_id,
+            "title": f"{skills[0]} {rng.choice(TITLES)}",
+            "company": f"Company {employer_id}",
+            "location": rng.choice(LOCATIONS),
+            "job_type": rng.choice(JOB_TYPES),
+            "description": f"Synthetic job post {job_post_id} looking for {', '.join(skills)}.",
+            "requirements": [f"Experience with {skill}" for skill in skills],
+            "salary_min": salary_min,
+            "salary_max": salary_min + rng.randrange(0, 10_000_000, 500_000),
+            "created_at": now - timedelta(minutes=job_post_id),
+        })
+        data.job_post_ids.append(job_post_id)
+        data.job_posts_by_employer.setdefault(employer_id, []).append(job_post_id)
+    if job_posts:
+        await db.job_posts.insert_many(job_posts)
+
+    # All seeded applications point at one stored CV
+    cv_reference = {}
+    if gridfs:
+        cv_reference = await store_cv(db, SAMPLE_CV, "cv.pdf", "application/pdf")
+    applications = []
+    max_pairs = len(data.seeker_ids) * len(data.job_post_ids)
+    while len(applications) < min(config.applications, max_pairs):
+        pair = (rng.choice(data.seeker_ids), rng.choice(data.job_post_ids))
+        if pair in data.applied:
+            continue
+        data.applied.add(pair)
+        application_id = len(applications) + 1
+        applications.append({
+            "_id": application_id,
+            "user_id": pair[0],
+            "job_post_id": pair[1],
+            "status": rng.choice(["Pending", "Pending", "Accepted", "Rejected"]),
+            "cv_filename": "cv.pdf",
+            "cv_content_type": "application/pdf",
+            **cv_reference,
+            "created_at": now - timedelta(seconds=application_id),
+        })
+    if applications:
+        await db.applications.insert_many(applications)
+
+    # Counters continue after the seeded ids
+    for name, count in (("users", len(users)), ("profiles", len(profiles)),
+                        ("job_posts", len(job_posts)), ("applications", len(applications))):
+        await db.counters.update_one({"_id": name}, {"$set": {"sequence_value": count}}, upsert=True)
+
+    try:
+        await ensure_indexes(db)
+    except Exception as e:
+        # The in-memory stand-in does not support every index type
+        print(f"Could not create indexes: {e}")
+    return data
@@ -0,0 +1,88 @@
+"""Measure how a burst of logins affects unrelated requests on the same worker.
+
+A probe coroutine stands in for a cheap endpoint (e.g. ``GET /job-posts/{id}``):
+it is scheduled every few milliseconds and records how late it actually runs.
+The storm is run twice, once verifying passwords inline on the event loop (the
+old behaviour) and once through the bounded hashing pool.
+
+Usage (from the backend directory):
+    python -m benchmarks.login_storm --logins 50 --concurrency 25
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import HTTPException
+
+from app.utils import security
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def probe(latencies, stop, interval):
+    """Record the scheduling delay of a trivial request handler."""
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        latencies.append((time.perf_counter() - expected) * 1000)
+
+
+async def login(hashed, mode, rejected):
+    if mode == "inline":
+        security.verify_password("correct horse", hashed)
+        return
+    try:
+        await security.verify_password_async("correct horse", hashed)
+    except HTTPException:
+        rejected.append(1)
+
+
+async def storm(mode, hashed, logins, concurrency, interval):
+    latencies, rejected = [], []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(latencies, stop, interval))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited():
+        async with semaphore:
+            await login(hashed, mode, rejected)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(limited() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe_task
+    return {
+        "mode": mode,
+        "logins": logins,
+        "rejected": len(rejected),
+        "elapsed_s": round(elapsed, 3),
+        "probe_samples": len(latencies),
+        "probe_p50_ms": round(percentile(latencies, 50), 2),
+        "probe_p99_ms": round(percentile(latencies, 99), 2),
+        "probe_max_ms": round(max(latencies, default=0.0), 2),
+        "probe_mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+    }
+
+
+async def main(args):
+    hashed = security.get_password_hash("correct horse")
+    for mode in ("inline", "pool"):
+        result = await storm(mode, hashed, args.logins, args.concurrency, args.interval / 1000)
+        print(result)
+    security.shutdown_hash_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=25)
+    parser.add_argument("--interval", type=float, default=5.0, help="probe interval in ms")
+    asyncio.run(main(parser.parse_args()))
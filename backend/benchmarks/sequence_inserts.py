@@ -0,0 +1,79 @@
+"""Inserts per second with per-insert counter updates vs block-allocated IDs.
+
+Writes to a scratch database (MONGO_DB_NAME, default ``jobseeker_bench``) on
+MONGO_URI and removes the collections and counters it created afterwards.
+Database names without "bench" are refused.
+
+Usage (from the backend directory):
+    MONGO_URI=mongodb://localhost:27017 python -m benchmarks.sequence_inserts --inserts 5000 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime
+
+os.environ.setdefault("MONGO_DB_NAME", "jobseeker_bench")
+
+from database import db  # noqa: E402
+from app.utils import sequences  # noqa: E402
+
+MODES = ("per_insert", "block")
+
+
+async def per_insert_counter(sequence_name):
+    """The previous implementation: one counter round trip per ID."""
+    result = await db.counters.find_one_and_update(
+        {"_id": sequence_name},
+        {"$inc": {"sequence_value": 1}},
+        upsert=True,
+        return_document=True
+    )
+    return result["sequence_value"]
+
+
+async def run(label, next_id, inserts, concurrency):
+    collection = db[f"bench_{label}"]
+    await collection.drop()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def insert_one():
+        async with semaphore:
+            new_id = await next_id(label)
+            await collection.insert_one({"_id": new_id, "created_at": datetime.utcnow()})
+
+    started = time.perf_counter()
+    await asyncio.gather(*(insert_one() for _ in range(inserts)))
+    elapsed = time.perf_counter() - started
+    return {
+        "mode": label,
+        "inserts": inserts,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "inserts_per_s": round(inserts / elapsed, 1),
+        "distinct_ids": len(await collection.distinct("_id")),
+    }
+
+
+async def cleanup():
+    """Remove only what the benchmark wrote: its collections and counter documents."""
+    for label in MODES:
+        await db[f"bench_{label}"].drop()
+    await db.counters.delete_many({"_id": {"$in": list(MODES)}})
+
+
+async def main(args):
+    if "bench" not in db.name:
+        raise SystemExit(f"Refusing to write to database '{db.name}': set MONGO_DB_NAME to a name containing 'bench'")
+    try:
+        print(await run("per_insert", per_insert_counter, args.inserts, args.concurrency))
+        print(await run("block", sequences.get_next_sequence_value, args.inserts, args.concurrency))
+    finally:
+        await cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--inserts", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
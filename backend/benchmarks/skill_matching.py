@@ -0,0 +1,53 @@
+"""Time to rank synthetic job seekers on the skill index.
+
+Builds a SkillIndex over random profiles and scores job requirements against
+all of them, as GET /job-posts/{id}/matches?scope=all does. Needs no database.
+
+Usage (from the backend directory):
+    python -m benchmarks.skill_matching --profiles 100000 --queries 50
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.utils.skills import SkillIndex
+
+
+def build_index(profiles, vocabulary_size, skills_per_profile, seed):
+    rng = random.Random(seed)
+    vocabulary = [f"skill {n}" for n in range(vocabulary_size)]
+    index = SkillIndex("benchmark")
+    started = time.perf_counter()
+    for user_id in range(profiles):
+        index.set(user_id, set(rng.sample(vocabulary, skills_per_profile)))
+    # Include the first flush of pending postings in the build time
+    index.score({vocabulary[0]})
+    return index, vocabulary, time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=100000)
+    parser.add_argument("--vocabulary", type=int, default=2000, help="distinct skills")
+    parser.add_argument("--skills", type=int, default=10, help="skills per profile")
+    parser.add_argument("--required", type=int, default=8, help="required skills per job post")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    index, vocabulary, build_seconds = build_index(args.profiles, args.vocabulary, args.skills, args.seed)
+    rng = random.Random(args.seed + 1)
+    timings = []
+    for _ in range(args.queries):
+        required = set(rng.sample(vocabulary, args.required))
+        started = time.perf_counter()
+        index.score(required, limit=20)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    print({
+        "profiles": args.profiles,
+        "build_seconds": round(build_seconds, 3),
+        "score_ms_p50": round(statistics.median(timings), 3),
+        "score_ms_max": round(timings[-1], 3),
+    })
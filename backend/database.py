@@ -1,8 +1,12 @@
 import motor.motor_asyncio
 from pymongo import MongoClient
+import asyncio
 import os
+import time
+from datetime import datetime
 from dotenv import load_dotenv
 from fastapi import HTTPException, status
+from app.utils.metrics import CommandMetrics, PoolMetrics
 
 # Load environment variables
 load_dotenv()
@@ -10,26 +14,105 @@ load_dotenv()
 # MongoDB connection string
 MONGO_URI = os.getenv("MONGO_URI")
 
-# Create a client instance
-client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_URI)
+# Seconds between background connection probes, and how long a probe may take
+DB_HEALTH_INTERVAL = float(os.getenv("DB_HEALTH_INTERVAL", 10))
+DB_PROBE_TIMEOUT = float(os.getenv("DB_PROBE_TIMEOUT", 5))
+
+# Create a client instance; the listeners feed command and pool timings to /metrics
+client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_URI, event_listeners=[CommandMetrics(), PoolMetrics()])
 
 # Get database instance (specify database name explicitly)
-db = client.jobseeker  # Use 'jobseeker' to match Atlas database name
+# Defaults to 'jobseeker' to match Atlas database name; benchmarks use a scratch one
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "jobseeker")
+db = client[MONGO_DB_NAME]
+
+class ConnectionState:
+    """Last known state of the MongoDB connection, refreshed by the health monitor."""
+
+    def __init__(self):
+        self.connected = False
+        self.last_probe = None  # time.monotonic() of the last finished probe
+        self.last_probe_at = None
+        self.latency_ms = None
+        self.error = None
+
+    def record(self, connected: bool, latency_ms: float = None, error: str = None):
+        if connected != self.connected or error != self.error:
+            if connected:
+                print("MongoDB connection is healthy")
+            else:
+                print(f"MongoDB connection error: {error}")
+        self.connected = connected
+        self.latency_ms = latency_ms
+        self.error = error
+        self.last_probe = time.monotonic()
+        self.last_probe_at = datetime.utcnow()
+
+    @property
+    def age(self):
+        """Seconds since the last probe finished, or None if never probed."""
+        if self.last_probe is None:
+            return None
+        return time.monotonic() - self.last_probe
+
+    @property
+    def is_stale(self):
+        """True when no probe has run recently (e.g. the monitor is not running)."""
+        return self.last_probe is None or self.age > DB_HEALTH_INTERVAL * 3
+
+    def as_dict(self):
+        return {
+            "connected": self.connected,
+            "last_probe_at": self.last_probe_at.isoformat() if self.last_probe_at else None,
+            "last_probe_age_seconds": round(self.age, 3) if self.age is not None else None,
+            "latency_ms": round(self.latency_ms, 3) if self.latency_ms is not None else None,
+            "error": self.error,
+        }
+
+connection_state = ConnectionState()
+_monitor_task = None
 
 # Function to check database connection
 async def check_connection():
+    """Probe the server once and record the result in `connection_state`."""
+    started = time.perf_counter()
     try:
-        # The ismaster command is cheap and does not require auth
-        await client.admin.command('ismaster')
-        return True
+        # The ping command is cheap and does not require auth
+        await asyncio.wait_for(client.admin.command('ping'), timeout=DB_PROBE_TIMEOUT)
     except Exception as e:
-        print(f"MongoDB connection error: {e}")
+        connection_state.record(False, error=str(e) or e.__class__.__name__)
         return False
+    connection_state.record(True, latency_ms=(time.perf_counter() - started) * 1000)
+    return True
+
+async def _monitor_connection():
+    while True:
+        await check_connection()
+        await asyncio.sleep(DB_HEALTH_INTERVAL)
+
+def start_monitor():
+    """Start the background health monitor on the running event loop."""
+    global _monitor_task
+    if _monitor_task is None or _monitor_task.done():
+        _monitor_task = asyncio.create_task(_monitor_connection())
+
+async def stop_monitor():
+    """Cancel the background health monitor."""
+    global _monitor_task
+    if _monitor_task is not None:
+        _monitor_task.cancel()
+        try:
+            await _monitor_task
+        except asyncio.CancelledError:
+            pass
+        _monitor_task = None
 
 # Dependency to check database connection
 async def get_db():
-    is_connected = await check_connection()
-    if not is_connected:
+    # Read the state cached by the monitor; only probe inline if it is not running
+    if connection_state.is_stale:
+        await check_connection()
+    if not connection_state.connected:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Could not connect to the database",
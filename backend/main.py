@@ -1,14 +1,26 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, status, Response
 from fastapi.middleware.cors import CORSMiddleware
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+import asyncio
 import os
 from dotenv import load_dotenv
-from database import db, check_connection
+from database import db, get_db, check_connection, connection_state, start_monitor, stop_monitor
+from app.utils.security import shutdown_hash_pool
+from app.utils.cache import cache_stats
+from app.utils.db_stats import database_info
+from app.utils.metrics import MetricsMiddleware, render as render_metrics
+from app.utils.body_limit import BodySizeLimitMiddleware
+from app.utils.auth import get_metrics_reader
+from app.utils.cv_storage import CV_MAX_BYTES
+from app.models.indexes import ensure_indexes
+from app.utils.jobs import start_job_workers, stop_job_workers
+from app.utils.skills import start_skill_index_build
 from app.routes.users import router as users_router
 from app.routes.profiles import router as profiles_router
-from app.routes.job_posts import router as job_posts_router
+from app.routes.job_posts import router as job_posts_router, BULK_IMPORT_MAX_BYTES
 from app.routes.applications import router as applications_router
 from app.routes.auth import router as auth_router
+from app.routes.jobs import router as jobs_router
 
 # Load environment variables
 load_dotenv()
@@ -31,21 +43,50 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browsers read the validators used for conditional requests
+    expose_headers=["ETag", "Last-Modified"],
 )
 
 # Add ProxyHeadersMiddleware to trust proxy headers from Railway
 # Memperbaiki masalah redirect HTTP -> HTTPS
 app.add_middleware(ProxyHeadersMiddleware, trusted_hosts="*")
 
-# Dependency to check database connection
-async def get_db():
-    is_connected = await check_connection()
-    if not is_connected:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Could not connect to the database",
-        )
-    return db
+# Refuse oversized uploads before FastAPI reads and parses the body (allow for the form overhead)
+app.add_middleware(BodySizeLimitMiddleware, limits={
+    "/applications/upload": CV_MAX_BYTES + 64 * 1024,
+    "/job-posts/bulk": BULK_IMPORT_MAX_BYTES,
+})
+
+# Count and time every request per route template for /metrics
+app.add_middleware(MetricsMiddleware, routes=app.routes)
+
+def _report_index_build(task: asyncio.Task):
+    # Nobody awaits the index build; without this a failure (e.g. server selection timeout) is silent
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None:
+        print(f"Index build failed, running without declared indexes: {error!r}")
+    else:
+        print(f"Index build finished for {len(task.result())} collections")
+
+@app.on_event("startup")
+async def startup():
+    # Track database health in the background so requests never ping Mongo
+    start_monitor()
+    # Build declared indexes without holding up startup (no-op when they exist)
+    app.state.index_task = asyncio.create_task(ensure_indexes(db))
+    app.state.index_task.add_done_callback(_report_index_build)
+    # Process queued background jobs (cascading deletes) in this process
+    start_job_workers(db)
+    # Load profiles and job posts into the in-memory skill index for candidate matching
+    start_skill_index_build(db)
+
+@app.on_event("shutdown")
+async def shutdown():
+    await stop_job_workers()
+    await stop_monitor()
+    shutdown_hash_pool()
 
 # Root endpoint
 @app.get("/")
@@ -54,25 +95,33 @@ async def root():
 
 # Health check endpoint
 @app.get("/health")
-async def health_check(db = Depends(get_db)):
-    return {"status": "ok", "database": "connected"}
+async def health_check():
+    """Report the database state recorded by the background monitor."""
+    if connection_state.is_stale:
+        await check_connection()
+    database = connection_state.as_dict()
+    if not connection_state.connected:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"status": "error", "database": database},
+        )
+    return {"status": "ok", "database": database}
+
+@app.get("/cache-stats", include_in_schema=False, dependencies=[Depends(get_metrics_reader)])
+async def get_cache_stats():
+    """Hit/miss counters of the in-process caches."""
+    return cache_stats()
+
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(get_metrics_reader)])
+async def get_metrics():
+    """Request, MongoDB and cache metrics in the Prometheus text format."""
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 @app.get("/db-info")
 async def get_database_info():
-    """Get database information"""
+    """Get database information: per-collection counts, data and index sizes (cached briefly)"""
     try:
-        collections = await db.list_collection_names()
-        info = {
-            "database_name": db.name,
-            "collections": collections,
-            "collection_counts": {}
-        }
-        
-        for collection_name in collections:
-            count = await db[collection_name].count_documents({})
-            info["collection_counts"][collection_name] = count
-            
-        return info
+        return await database_info(db)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -84,4 +133,5 @@ app.include_router(auth_router)
 app.include_router(users_router)
 app.include_router(profiles_router)
 app.include_router(job_posts_router)
-app.include_router(applications_router)
\ No newline at end of file
+app.include_router(applications_router)
+app.include_router(jobs_router)
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""Move base64 CVs embedded in application documents into GridFS.
+
+Each application with a ``cv_data`` field gets its CV stored in the ``cvs``
+bucket, the reference fields (cv_file_id, cv_size, cv_sha256) set and
+``cv_data`` removed. Already migrated applications are skipped, so the script
+can be re-run safely.
+
+Usage (from the backend directory):
+    python -m scripts.migrate_cvs_to_gridfs [--dry-run] [--batch-size 50]
+"""
+import argparse
+import asyncio
+
+from fastapi import HTTPException
+
+from database import db
+from app.utils.cv_storage import decode_cv_data, store_cv, delete_cv
+
+
+async def migrate(dry_run: bool, batch_size: int):
+    pending = {"cv_data": {"$exists": True}, "cv_file_id": None}
+    total = await db.applications.count_documents(pending)
+    print(f"{total} application(s) to migrate")
+    if dry_run:
+        return
+
+    migrated = failed = 0
+    last_id = None
+    while True:
+        # Walk by _id so each batch only holds batch_size CVs in memory
+        query = dict(pending)
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = await db.applications.find(
+            query,
+            {"cv_data": 1, "cv_filename": 1, "cv_content_type": 1}
+        ).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+        for application in batch:
+            last_id = application["_id"]
+            try:
+                data = decode_cv_data(application["cv_data"] or "")
+            except HTTPException:
+                print(f"Application {application['_id']}: cv_data is not valid base64, skipped")
+                failed += 1
+                continue
+            reference = await store_cv(
+                db,
+                data,
+                application.get("cv_filename") or f"cv-{application['_id']}",
+                application.get("cv_content_type") or "application/pdf"
+            )
+            result = await db.applications.update_one(
+                {"_id": application["_id"], "cv_data": {"$exists": True}},
+                {"$set": reference, "$unset": {"cv_data": ""}}
+            )
+            if result.modified_count:
+                migrated += 1
+            else:
+                # Changed concurrently; drop the copy we just stored
+                await delete_cv(db, reference["cv_file_id"])
+        print(f"Migrated {migrated}/{total}")
+    print(f"Done: {migrated} migrated, {failed} failed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="only count the pending applications")
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(migrate(args.dry_run, args.batch_size))
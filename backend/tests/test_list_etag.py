@@ -0,0 +1,49 @@
+"""The weak ETag of a projected list page must change when a listed row is updated.
+
+Runs against mongomock-motor (pip install -r benchmarks/requirements.txt):
+    python -m pytest tests
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import Request, Response
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from app.utils.http_cache import conditional_list  # noqa: E402
+from app.utils.pagination import fetch_page  # noqa: E402
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/applications/", "headers": headers})
+
+
+async def _list_etag(collection, if_none_match=None):
+    documents, next_cursor = await fetch_page(collection, {}, 0, 10, projection={"status": 1})
+    response = Response()
+    not_modified = conditional_list(_request(if_none_match), response, "applications", documents, None, next_cursor, "status")
+    return not_modified, response.headers.get("etag")
+
+
+def test_update_changes_projected_list_etag():
+    async def scenario():
+        collection = mongomock_motor.AsyncMongoMockClient()["jobseeker_test"].applications
+        created_at = datetime.utcnow() - timedelta(hours=1)
+        await collection.insert_many([
+            {"_id": 1, "status": "Pending", "created_at": created_at},
+            {"_id": 2, "status": "Pending", "created_at": created_at - timedelta(minutes=1)},
+        ])
+        _, etag = await _list_etag(collection)
+        assert etag
+
+        not_modified, _ = await _list_etag(collection, etag)
+        assert not_modified is not None and not_modified.status_code == 304
+
+        await collection.update_one({"_id": 1}, {"$set": {"status": "Accepted", "updated_at": datetime.utcnow()}})
+        not_modified, new_etag = await _list_etag(collection, etag)
+        assert not_modified is None
+        assert new_etag != etag
+
+    asyncio.run(scenario())
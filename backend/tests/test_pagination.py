@@ -0,0 +1,32 @@
+"""Cursor pages must walk every document, including ones stored without created_at.
+
+Runs against mongomock-motor (pip install -r benchmarks/requirements.txt):
+    python -m pytest tests
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from app.utils.pagination import fetch_page  # noqa: E402
+
+
+def test_cursor_pages_include_undated_documents():
+    async def scenario():
+        collection = mongomock_motor.AsyncMongoMockClient()["jobseeker_test"].job_posts
+        now = datetime.utcnow()
+        await collection.insert_many(
+            [{"_id": f"dated-{i}", "created_at": now - timedelta(minutes=i)} for i in range(3)]
+            + [{"_id": f"undated-{i}"} for i in range(3)]
+        )
+        seen, cursor = [], None
+        while True:
+            documents, cursor = await fetch_page(collection, {}, 0, 2, cursor=cursor, projection={})
+            seen += [document["_id"] for document in documents]
+            if cursor is None:
+                break
+        assert seen == ["dated-0", "dated-1", "dated-2", "undated-2", "undated-1", "undated-0"]
+
+    asyncio.run(scenario())
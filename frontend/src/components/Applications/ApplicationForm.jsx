@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useParams, useNavigate, useLocation } from 'react-router-dom';
-import { createApplication, getUserProfile, getApplicationsByUser } from '../../services/api';
+import { uploadApplication, getUserProfile, getApplicationsByUser } from '../../services/api';
 import { useAuth } from '../../context/AuthContext';
 
 const ApplicationForm = () => {
@@ -135,19 +135,8 @@ const ApplicationForm = () => {
         }
 
         try {
-            // Convert CV file to base64
-            const cvFileBase64 = await fileToBase64(formData.cv_file);
-            
-            // Prepare application data
-            const applicationData = {
-                user_id: user._id,
-                job_post_id: parseInt(formData.job_post_id),
-                cv_data: cvFileBase64,
-                cv_filename: formData.cv_file.name,
-                cv_content_type: formData.cv_file.type
-            };
-
-            await createApplication(applicationData);
+            // Upload the CV file directly (multipart)
+            await uploadApplication(user._id, parseInt(formData.job_post_id), formData.cv_file);
             
             // Navigate back to job detail with success message
             navigate(`/jobs/${jobPostId}`, {
@@ -164,20 +153,6 @@ const ApplicationForm = () => {
         }
     };
 
-    // Helper function to convert file to base64
-    const fileToBase64 = (file) => {
-        return new Promise((resolve, reject) => {
-            const reader = new FileReader();
-            reader.readAsDataURL(file);
-            reader.onload = () => {
-                // Remove the data URL prefix (e.g., "data:application/pdf;base64,")
-                const base64String = reader.result.split(',')[1];
-                resolve(base64String);
-            };
-            reader.onerror = (error) => reject(error);
-        });
-    };
-
     // Don't render if user is not authenticated or not a jobseeker
     if (!user || user.role !== 'Job Seeker') {
         return null;
@@ -1,5 +1,5 @@
 import React, { useEffect, useState } from 'react';
-import { getApplicationsByUser, getJobPost } from '../../services/api';
+import { getApplicationsByUser, getJobPost, downloadApplicationCv } from '../../services/api';
 import { useAuth } from '../../context/AuthContext';
 
 const ApplicationList = () => {
@@ -49,14 +49,13 @@ const ApplicationList = () => {
         fetchApplications();
     }, [user]);
 
-    // Fungsi untuk download CV dari base64
-    const handleDownloadCV = (filename, base64, mimeType = 'application/pdf') => {
-        const link = document.createElement('a');
-        link.href = `data:${mimeType};base64,${base64}`;
-        link.download = filename;
-        document.body.appendChild(link);
-        link.click();
-        document.body.removeChild(link);
+    // Fungsi untuk download CV dari backend
+    const handleDownloadCV = async (applicationId, filename) => {
+        try {
+            await downloadApplicationCv(applicationId, filename);
+        } catch (err) {
+            alert(err.message);
+        }
     };
 
     if (loading) return <div className="text-center py-8">Loading...</div>;
@@ -96,10 +95,10 @@ const ApplicationList = () => {
                                         {app.status}
                                     </span>
                                 </td>
-                                <td>{app.cv_filename && app.cv_data ? (
+                                <td>{app.cv_filename ? (
                                     <button
                                         className="text-blue-600 underline hover:text-blue-800"
-                                        onClick={() => handleDownloadCV(app.cv_filename, app.cv_data, app.cv_content_type)}
+                                        onClick={() => handleDownloadCV(app._id, app.cv_filename)}
                                     >
                                         {app.cv_filename}
                                     </button>
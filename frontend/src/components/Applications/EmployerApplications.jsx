@@ -1,6 +1,6 @@
 import React, { useEffect, useState, useCallback } from 'react';
 import { Link } from 'react-router-dom';
-import { getApplicationsByJob, updateApplication, getUser } from '../../services/api';
+import { getApplicationsByJob, updateApplication, getUser, downloadApplicationCv } from '../../services/api';
 import jobPostService from '../../services/jobPosts';
 import { useAuth } from '../../context/AuthContext';
 
@@ -82,6 +82,14 @@ const EmployerApplications = () => {
         }
     };
 
+    const handleDownloadCV = async (appId, filename) => {
+        try {
+            await downloadApplicationCv(appId, filename);
+        } catch (err) {
+            alert(err.message);
+        }
+    };
+
     if (loading) return <div className="text-center py-8">Loading...</div>;
     if (error) return <div className="text-center text-red-500 py-8">{error}</div>;
 
@@ -156,14 +164,13 @@ const EmployerApplications = () => {
                                         {app.status}
                                     </span>
                                 </td>
-                                <td>{app.cv_filename && app.cv_data ? (
-                                    <a
+                                <td>{app.cv_filename ? (
+                                    <button
                                         className="text-blue-600 underline hover:text-blue-800"
-                                        href={`data:${app.cv_content_type || 'application/pdf'};base64,${app.cv_data}`}
-                                        download={app.cv_filename}
+                                        onClick={() => handleDownloadCV(app._id, app.cv_filename)}
                                     >
                                         {app.cv_filename}
-                                    </a>
+                                    </button>
                                 ) : 'No CV'}</td>
                                 <td>{app.created_at ? new Date(app.created_at).toLocaleDateString() : 'N/A'}</td>
                                 <td className="space-x-2">
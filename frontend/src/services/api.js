@@ -121,6 +121,22 @@ export const getApplicationsByJob = async (jobPostId, params = {}) => {
   }
 };
 
+// Kirim lamaran dengan CV sebagai file (multipart), tanpa konversi base64
+export const uploadApplication = async (userId, jobPostId, cvFile) => {
+  try {
+    const formData = new FormData();
+    formData.append('user_id', userId);
+    formData.append('job_post_id', jobPostId);
+    formData.append('cv', cvFile);
+    const response = await api.post('/applications/upload', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+    return response.data;
+  } catch (error) {
+    throw new Error(error.response?.data?.detail || 'Failed to create application');
+  }
+};
+
 export const createApplication = async (applicationData) => {
   try {
     const response = await api.post('/applications', applicationData);
@@ -130,6 +146,23 @@ export const createApplication = async (applicationData) => {
   }
 };
 
+// Unduh CV lamaran; endpoint membutuhkan token, jadi tidak bisa lewat link biasa
+export const downloadApplicationCv = async (applicationId, filename) => {
+  try {
+    const response = await api.get(`/applications/${applicationId}/cv`, { responseType: 'blob' });
+    const url = window.URL.createObjectURL(response.data);
+    const link = document.createElement('a');
+    link.href = url;
+    link.download = filename || `cv-${applicationId}`;
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+    window.URL.revokeObjectURL(url);
+  } catch (error) {
+    throw new Error(error.response?.status === 403 ? 'Not authorized to download this CV' : 'Failed to download CV');
+  }
+};
+
 export const updateApplication = async (applicationId, updateData) => {
   try {
     const response = await api.put(`/applications/${applicationId}`, updateData);